@@ -0,0 +1,41 @@
+"""add bid indexes and one bid per user and plate
+
+Revision ID: add_bid_indexes
+Revises: add_plate_bid_stats
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_bid_indexes'
+down_revision = 'add_plate_bid_stats'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Keep only the highest bid of each user on each plate
+    op.execute("""
+        DELETE FROM bids WHERE id NOT IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY plate_id, user_id ORDER BY amount DESC, id DESC
+                ) AS position
+                FROM bids
+            ) WHERE position = 1
+        )
+    """)
+    op.execute("""
+        UPDATE auto_plates SET
+            highest_bid_amount = (SELECT MAX(amount) FROM bids WHERE bids.plate_id = auto_plates.id),
+            bid_count = (SELECT COUNT(*) FROM bids WHERE bids.plate_id = auto_plates.id)
+    """)
+
+    op.create_index('ix_bids_plate_id_amount', 'bids', ['plate_id', 'amount'])
+    op.create_index('ix_bids_user_id', 'bids', ['user_id'])
+    op.create_index('uq_bids_plate_id_user_id', 'bids', ['plate_id', 'user_id'], unique=True)
+
+def downgrade():
+    op.drop_index('uq_bids_plate_id_user_id', table_name='bids')
+    op.drop_index('ix_bids_user_id', table_name='bids')
+    op.drop_index('ix_bids_plate_id_amount', table_name='bids')
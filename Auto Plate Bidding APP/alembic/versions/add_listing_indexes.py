@@ -0,0 +1,25 @@
+"""add indexes for keyset pagination of bids
+
+Revision ID: add_listing_indexes
+Revises: add_proxy_bids
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_listing_indexes'
+down_revision = 'add_proxy_bids'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # (user_id, created_at) also serves plain lookups by user_id
+    op.drop_index('ix_bids_user_id', table_name='bids')
+    op.create_index('ix_bids_user_id_created_at', 'bids', ['user_id', 'created_at'])
+    op.create_index('ix_bids_created_at', 'bids', ['created_at'])
+
+def downgrade():
+    op.drop_index('ix_bids_created_at', table_name='bids')
+    op.drop_index('ix_bids_user_id_created_at', table_name='bids')
+    op.create_index('ix_bids_user_id', 'bids', ['user_id'])
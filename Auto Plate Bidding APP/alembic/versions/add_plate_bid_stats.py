@@ -0,0 +1,34 @@
+"""add denormalized bid stats to auto_plates
+
+Revision ID: add_plate_bid_stats
+Revises: add_starting_price
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import Numeric
+
+# revision identifiers, used by Alembic.
+revision = 'add_plate_bid_stats'
+down_revision = 'add_starting_price'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('auto_plates', sa.Column('highest_bid_amount', Numeric(10, 2), nullable=True))
+    op.add_column('auto_plates', sa.Column('bid_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from existing bids
+    op.execute("""
+        UPDATE auto_plates SET
+            highest_bid_amount = (SELECT MAX(amount) FROM bids WHERE bids.plate_id = auto_plates.id),
+            bid_count = (SELECT COUNT(*) FROM bids WHERE bids.plate_id = auto_plates.id)
+    """)
+
+    op.create_index('ix_auto_plates_active_deadline', 'auto_plates', ['is_active', 'deadline'])
+
+def downgrade():
+    op.drop_index('ix_auto_plates_active_deadline', table_name='auto_plates')
+    op.drop_column('auto_plates', 'bid_count')
+    op.drop_column('auto_plates', 'highest_bid_amount')
@@ -0,0 +1,45 @@
+"""add trigram full-text index over plate numbers
+
+Revision ID: add_plate_number_fts
+Revises: add_listing_indexes
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_plate_number_fts'
+down_revision = 'add_listing_indexes'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Needs SQLite 3.34+ for the trigram tokenizer
+    op.execute("""
+        CREATE VIRTUAL TABLE plate_number_fts USING fts5(
+            plate_number, content='auto_plates', content_rowid='id', tokenize='trigram'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER auto_plates_fts_insert AFTER INSERT ON auto_plates BEGIN
+            INSERT INTO plate_number_fts(rowid, plate_number) VALUES (new.id, new.plate_number);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER auto_plates_fts_delete AFTER DELETE ON auto_plates BEGIN
+            INSERT INTO plate_number_fts(plate_number_fts, rowid, plate_number) VALUES ('delete', old.id, old.plate_number);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER auto_plates_fts_update AFTER UPDATE OF plate_number ON auto_plates BEGIN
+            INSERT INTO plate_number_fts(plate_number_fts, rowid, plate_number) VALUES ('delete', old.id, old.plate_number);
+            INSERT INTO plate_number_fts(rowid, plate_number) VALUES (new.id, new.plate_number);
+        END
+    """)
+    op.execute("INSERT INTO plate_number_fts(plate_number_fts) VALUES ('rebuild')")
+
+def downgrade():
+    op.execute("DROP TRIGGER auto_plates_fts_update")
+    op.execute("DROP TRIGGER auto_plates_fts_delete")
+    op.execute("DROP TRIGGER auto_plates_fts_insert")
+    op.execute("DROP TABLE plate_number_fts")
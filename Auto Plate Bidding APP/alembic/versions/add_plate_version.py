@@ -0,0 +1,24 @@
+"""add version column to auto_plates
+
+Revision ID: add_plate_version
+Revises: add_plate_number_fts
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_plate_version'
+down_revision = 'add_plate_number_fts'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column(
+        'auto_plates',
+        sa.Column('version', sa.Integer(), nullable=False, server_default='0')
+    )
+
+def downgrade():
+    op.drop_column('auto_plates', 'version')
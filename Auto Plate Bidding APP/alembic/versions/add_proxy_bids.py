@@ -0,0 +1,36 @@
+"""add proxy_bids table
+
+Revision ID: add_proxy_bids
+Revises: add_snipe_protection
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import Numeric
+
+# revision identifiers, used by Alembic.
+revision = 'add_proxy_bids'
+down_revision = 'add_snipe_protection'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'proxy_bids',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('max_amount', Numeric(10, 2), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('plate_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['plate_id'], ['auto_plates.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_proxy_bids_id', 'proxy_bids', ['id'])
+    op.create_index('uq_proxy_bids_plate_id_user_id', 'proxy_bids', ['plate_id', 'user_id'], unique=True)
+
+def downgrade():
+    op.drop_index('uq_proxy_bids_plate_id_user_id', table_name='proxy_bids')
+    op.drop_index('ix_proxy_bids_id', table_name='proxy_bids')
+    op.drop_table('proxy_bids')
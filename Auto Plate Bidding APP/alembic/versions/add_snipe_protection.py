@@ -0,0 +1,23 @@
+"""add anti-sniping settings to auto_plates
+
+Revision ID: add_snipe_protection
+Revises: add_bid_indexes
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_snipe_protection'
+down_revision = 'add_bid_indexes'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('auto_plates', sa.Column('snipe_window_seconds', sa.Integer(), nullable=True))
+    op.add_column('auto_plates', sa.Column('snipe_extension_seconds', sa.Integer(), nullable=True))
+
+def downgrade():
+    op.drop_column('auto_plates', 'snipe_extension_seconds')
+    op.drop_column('auto_plates', 'snipe_window_seconds')
@@ -0,0 +1,167 @@
+import asyncio
+import heapq
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update
+
+import models
+
+# Called with one dict per closed plate, after the transaction commits
+ClosedCallback = Callable[[List[dict]], Awaitable[None]]
+
+
+class AuctionScheduler:
+    """Closes auctions when their deadline passes
+
+    Upcoming deadlines live in a min-heap, so scheduling or moving a
+    deadline costs O(log n) and the loop only sleeps until the earliest
+    one. Moved or cancelled deadlines leave stale heap entries behind;
+    they are skipped when they reach the top. Plates that are due together
+    are closed in one transaction.
+    """
+
+    def __init__(self, session_factory, on_closed: ClosedCallback, batch_size: int = 500):
+        self.session_factory = session_factory
+        self.on_closed = on_closed
+        self.batch_size = batch_size
+        self.heap: List[Tuple[datetime, int]] = []
+        # plate_id -> current deadline, the source of truth for the heap
+        self.deadlines: Dict[int, datetime] = {}
+        self.closed_total = 0
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Rebuild the schedule from the active plates and start the loop"""
+        async with self.session_factory() as db:
+            rows = await db.execute(
+                select(models.AutoPlate.id, models.AutoPlate.deadline)
+                .where(models.AutoPlate.is_active == True)
+            )
+            self.deadlines = {plate_id: deadline for plate_id, deadline in rows}
+
+        self.heap = [(deadline, plate_id) for plate_id, deadline in self.deadlines.items()]
+        heapq.heapify(self.heap)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def schedule(self, plate_id: int, deadline: datetime):
+        """Add a plate or move its deadline"""
+        if self.deadlines.get(plate_id) == deadline:
+            return
+        self.deadlines[plate_id] = deadline
+        heapq.heappush(self.heap, (deadline, plate_id))
+        if self.heap[0] == (deadline, plate_id):
+            # New earliest deadline, the loop must sleep less
+            self._wakeup.set()
+
+    def unschedule(self, plate_id: int):
+        self.deadlines.pop(plate_id, None)
+
+    def stats(self) -> dict:
+        next_deadline = self._peek()
+        return {
+            "scheduled": len(self.deadlines),
+            "heap_size": len(self.heap),
+            "closed_total": self.closed_total,
+            "next_deadline": next_deadline.isoformat() if next_deadline else None,
+        }
+
+    def _peek(self) -> Optional[datetime]:
+        # Drop entries whose deadline was moved or cancelled
+        while self.heap and self.deadlines.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else None
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            next_deadline = self._peek()
+            timeout = None
+            if next_deadline is not None:
+                timeout = (next_deadline - datetime.now()).total_seconds()
+
+            if timeout is None or timeout > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            due = []
+            now = datetime.now()
+            while len(due) < self.batch_size and self._peek() is not None and self.heap[0][0] <= now:
+                _, plate_id = heapq.heappop(self.heap)
+                del self.deadlines[plate_id]
+                due.append(plate_id)
+
+            try:
+                await self._close(due, now)
+            except Exception as e:
+                print(f"Auction scheduler error: {e}")
+                # Try again shortly instead of losing the plates
+                for plate_id in due:
+                    self.schedule(plate_id, now)
+                await asyncio.sleep(1)
+
+    async def _close(self, plate_ids: List[int], now: datetime):
+        async with self.session_factory() as db:
+            # Another worker may have closed a plate or moved its deadline
+            closed = await db.execute(
+                update(models.AutoPlate)
+                .where(
+                    models.AutoPlate.id.in_(plate_ids),
+                    models.AutoPlate.is_active == True,
+                    models.AutoPlate.deadline <= now
+                )
+                # In-flight bids with an older version fail instead of landing late
+                .values(is_active=False, version=models.AutoPlate.version + 1)
+                .returning(models.AutoPlate.id, models.AutoPlate.highest_bid_amount)
+            )
+            closed = {plate_id: amount for plate_id, amount in closed}
+
+            winners = {}
+            if closed:
+                rows = await db.execute(
+                    select(models.Bid.plate_id, models.Bid.user_id, models.User.username)
+                    .join(models.AutoPlate, models.AutoPlate.id == models.Bid.plate_id)
+                    .join(models.User, models.User.id == models.Bid.user_id)
+                    .where(
+                        models.Bid.plate_id.in_(closed),
+                        models.Bid.amount == models.AutoPlate.highest_bid_amount
+                    )
+                )
+                winners = {plate_id: (user_id, username) for plate_id, user_id, username in rows}
+
+            # Plates extended elsewhere go back on the schedule
+            remaining = [plate_id for plate_id in plate_ids if plate_id not in closed]
+            if remaining:
+                rows = await db.execute(
+                    select(models.AutoPlate.id, models.AutoPlate.deadline)
+                    .where(models.AutoPlate.id.in_(remaining), models.AutoPlate.is_active == True)
+                )
+                for plate_id, deadline in rows:
+                    self.schedule(plate_id, deadline)
+
+            await db.commit()
+
+        if not closed:
+            return
+
+        self.closed_total += len(closed)
+        events = []
+        for plate_id, amount in closed.items():
+            winner_id, winner_username = winners.get(plate_id, (None, None))
+            events.append({
+                "plate_id": plate_id,
+                "winner_id": winner_id,
+                "winner_username": winner_username,
+                "winning_amount": float(amount) if amount is not None else None,
+                "closed_at": now.isoformat(),
+            })
+        await self.on_closed(events)
@@ -0,0 +1,92 @@
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+
+class UserSnapshot:
+    """Read-only copy of the user fields needed by request handlers"""
+
+    __slots__ = ("id", "username", "email", "is_staff")
+
+    def __init__(self, id: int, username: str, email: str, is_staff: bool):
+        self.id = id
+        self.username = username
+        self.email = email
+        self.is_staff = is_staff
+
+    @classmethod
+    def from_user(cls, user) -> "UserSnapshot":
+        return cls(user.id, user.username, user.email, bool(user.is_staff))
+
+
+class AuthCache:
+    """TTL-bounded LRU of auth tokens to user snapshots
+
+    An entry lives until the earlier of ``ttl_seconds`` and the token's own
+    expiry. Entries of a user are dropped by invalidate_user(), which is
+    wired to the User update and delete events and, once they are
+    committed, to the "users" channel of the broadcast bus so that every
+    worker drops them.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 60):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        # token -> (expires_at, snapshot)
+        self.entries: "OrderedDict[str, Tuple[float, UserSnapshot]]" = OrderedDict()
+        self.tokens_by_username: Dict[str, Set[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[UserSnapshot]:
+        entry = self.entries.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, snapshot = entry
+        if expires_at <= time.time():
+            self._remove(token)
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(token)
+        self.hits += 1
+        return snapshot
+
+    def put(self, token: str, snapshot: UserSnapshot, token_expires_at: Optional[float] = None):
+        expires_at = time.time() + self.ttl_seconds
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+
+        self._remove(token)
+        self.entries[token] = (expires_at, snapshot)
+        self.tokens_by_username.setdefault(snapshot.username, set()).add(token)
+
+        while len(self.entries) > self.max_size:
+            oldest = next(iter(self.entries))
+            self._remove(oldest)
+
+    def invalidate_user(self, username: str):
+        for token in list(self.tokens_by_username.get(username, ())):
+            self._remove(token)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _remove(self, token: str):
+        entry = self.entries.pop(token, None)
+        if entry is None:
+            return
+        username = entry[1].username
+        tokens = self.tokens_by_username.get(username)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self.tokens_by_username[username]
@@ -0,0 +1,75 @@
+"""Dealer-style bidding: one POST /bids/batch against the same bids sent one by one
+
+    python benchmarks/bench_batch_bids.py --dealers 10 --plates-per-dealer 20 --rounds 10
+"""
+import argparse
+import asyncio
+import time
+
+from common import load_app, seed
+
+
+async def run(args):
+    import httpx
+
+    main = load_app()
+    per_mode = args.dealers * args.plates_per_dealer
+    tokens, plate_ids = seed(main, args.dealers, per_mode * 2)
+    transport = httpx.ASGITransport(app=main.app)
+
+    # Count what watchers would receive
+    broadcasts = 0
+    publish = main.manager.bus.publish
+
+    async def counting_publish(message, plate_id):
+        nonlocal broadcasts
+        broadcasts += 1
+        await publish(message, plate_id)
+
+    main.manager.bus.publish = counting_publish
+
+    async def single(http, plates, amount):
+        for plate_id in plates:
+            response = await http.post("/bids/", json={"plate_id": plate_id, "amount": amount})
+            if response.status_code != 201:
+                raise RuntimeError(f"/bids/ -> {response.status_code} {response.text}")
+
+    async def batch(http, plates, amount):
+        response = await http.post(
+            "/bids/batch", json=[{"plate_id": plate_id, "amount": amount} for plate_id in plates]
+        )
+        results = response.json()
+        if response.status_code != 200 or any(result["status_code"] != 201 for result in results):
+            raise RuntimeError(f"/bids/batch -> {response.status_code} {response.text[:200]}")
+
+    # Each dealer bids on its own plates so no bid is rejected
+    modes = {"single": (single, plate_ids[:per_mode]), "batch": (batch, plate_ids[per_mode:])}
+    for name, (place, plates) in modes.items():
+        broadcasts = 0
+
+        async def dealer(index, token):
+            own = plates[index * args.plates_per_dealer:(index + 1) * args.plates_per_dealer]
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+                http.cookies.set("token", f"Bearer {token}")
+                for round_number in range(args.rounds):
+                    await place(http, own, 1000 + round_number * 100)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(dealer(i, token) for i, token in enumerate(tokens)))
+        elapsed = time.perf_counter() - start
+
+        bids = per_mode * args.rounds
+        print(
+            f"{name:7s} {bids} bids in {elapsed:6.2f} s  {bids / elapsed:8.1f} bids/s  "
+            f"{broadcasts} broadcasts"
+        )
+
+    await main.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dealers", type=int, default=10)
+    parser.add_argument("--plates-per-dealer", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=10)
+    asyncio.run(run(parser.parse_args()))
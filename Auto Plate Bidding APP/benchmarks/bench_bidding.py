@@ -0,0 +1,191 @@
+"""Bidding load test: hot and cold plates with WebSocket watchers, served in-process
+
+    python benchmarks/bench_bidding.py --bidders 50 --requests 2000 --watchers 20 \\
+        --output bench-bidding.json
+
+The "hot" scenario sends every bid to one plate, "cold" spreads them over
+--plates plates. Each bid amount is unique, so a watcher can tell which
+request a new_bid message belongs to and bid-to-broadcast latency is the
+time from sending the request to the message reaching the watcher.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import time
+from datetime import datetime
+
+from common import ASGIWebSocket, load_app, seed
+
+
+def percentiles(samples: list) -> dict:
+    if len(samples) < 2:
+        return {"count": len(samples)}
+    cuts = statistics.quantiles(samples, n=100)
+    return {
+        "count": len(samples),
+        "p50_ms": round(cuts[49] * 1000, 3),
+        "p95_ms": round(cuts[94] * 1000, 3),
+        "p99_ms": round(cuts[98] * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3),
+    }
+
+
+async def run_scenario(main, transport, tokens, plate_ids, args, amounts) -> dict:
+    import httpx
+
+    sent_at = {}
+    deliveries = []
+    frames = 0
+    snapshots = 0
+
+    def on_message(text, received_at):
+        nonlocal frames, snapshots
+        message = json.loads(text)
+        if message.get("action") == "snapshot":
+            snapshots += 1
+            return
+        if message.get("action") != "new_bid":
+            return
+        frames += 1
+        # A coalesced frame carries every bid it merged
+        for bid in message.get("bids", [message]):
+            started = sent_at.get((message["plate_id"], bid["bid_amount"]))
+            if started is not None:
+                deliveries.append(received_at - started)
+
+    watchers = [
+        ASGIWebSocket(main.app, f"/ws/{plate_id}", on_message)
+        for plate_id in plate_ids
+        for _ in range(args.watchers)
+    ]
+    dropped_before = main.manager.stats()["dropped_messages"]
+    for watcher in watchers:
+        await watcher.connect()
+    # A socket is accepted before it subscribes, bids must not start earlier
+    for _ in range(1000):
+        if snapshots >= len(watchers):
+            break
+        await asyncio.sleep(0.01)
+    else:
+        raise RuntimeError(f"{len(watchers) - snapshots} watchers did not get their snapshot")
+
+    latencies = []
+    statuses = {}
+    counter = iter(range(args.requests))
+    rng = random.Random(args.seed)
+
+    async def bidder(token):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            http.cookies.set("token", f"Bearer {token}")
+            for _ in counter:
+                plate_id = rng.choice(plate_ids)
+                amount = next(amounts)
+                start = time.perf_counter()
+                sent_at[(plate_id, float(amount))] = start
+                response = await http.post("/bids/", json={"plate_id": plate_id, "amount": amount})
+                latencies.append(time.perf_counter() - start)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                if response.status_code >= 500:
+                    raise RuntimeError(f"/bids/ -> {response.status_code}")
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(bidder(token) for token in tokens))
+        elapsed = time.perf_counter() - start
+
+        # Wait for every delivery, or, when some were dropped, until the
+        # writers have drained and nothing arrived for a while
+        expected = statuses.get(201, 0) * args.watchers
+        idle_polls = 0
+        for _ in range(1000):
+            delivered = len(deliveries)
+            if delivered >= expected:
+                break
+            await asyncio.sleep(0.01)
+            stats = main.manager.stats()
+            drained = not stats["queued_messages"] and not stats["pending_bids"]
+            idle_polls = idle_polls + 1 if drained and len(deliveries) == delivered else 0
+            if idle_polls >= 20:
+                break
+        websocket_stats = main.manager.stats()
+    finally:
+        for watcher in watchers:
+            await watcher.close()
+
+    accepted = statuses.get(201, 0)
+    return {
+        "plates": len(plate_ids),
+        "watchers": len(watchers),
+        "requests": args.requests,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(args.requests / elapsed, 1),
+        "accepted_bids_per_s": round(accepted / elapsed, 1),
+        "status_codes": {str(code): count for code, count in sorted(statuses.items())},
+        "create_bid_latency": percentiles(latencies),
+        "broadcast_latency": percentiles(deliveries),
+        "expected_deliveries": accepted * args.watchers,
+        "frames_per_watcher": round(frames / len(watchers), 1),
+        "dropped_messages": websocket_stats["dropped_messages"] - dropped_before,
+    }
+
+
+async def run(args):
+    import httpx
+
+    output = os.path.abspath(args.output) if args.output else None
+    if args.coalesce_ms is not None:
+        os.environ["AUCTION_WS_COALESCE_MS"] = str(args.coalesce_ms)
+    main = load_app()
+    tokens, plate_ids = seed(main, args.bidders, args.plates + 1)
+    transport = httpx.ASGITransport(app=main.app)
+
+    # Always increasing, so every bid is unique and most are accepted
+    amounts = itertools.count(1000)
+    scenarios = {
+        "hot": plate_ids[:1],
+        "cold": plate_ids[1:],
+    }
+
+    results = {
+        "started_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "config": vars(args),
+        "scenarios": {},
+    }
+    for name, plates in scenarios.items():
+        result = await run_scenario(main, transport, tokens, plates, args, amounts)
+        results["scenarios"][name] = result
+        latency = result["create_bid_latency"]
+        broadcast = result["broadcast_latency"]
+        print(
+            f"{name:5s} {result['throughput_rps']:8.1f} req/s  "
+            f"bid p50/p95/p99 {latency.get('p50_ms')}/{latency.get('p95_ms')}/{latency.get('p99_ms')} ms  "
+            f"broadcast p50/p99 {broadcast.get('p50_ms')}/{broadcast.get('p99_ms')} ms  "
+            f"{broadcast['count']}/{result['expected_deliveries']} delivered, {result['dropped_messages']} dropped  "
+            f"{result['frames_per_watcher']} frames/watcher  "
+            f"status {result['status_codes']}"
+        )
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {output}")
+
+    await main.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bidders", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000, help="bids per scenario")
+    parser.add_argument("--plates", type=int, default=50, help="plates of the cold scenario")
+    parser.add_argument("--watchers", type=int, default=10, help="WebSocket watchers per plate")
+    parser.add_argument("--coalesce-ms", type=int, help="override AUCTION_WS_COALESCE_MS")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,69 @@
+"""Concurrent-request throughput of the auction app, served in-process
+
+    python benchmarks/bench_concurrency.py --clients 50 --requests 2000
+"""
+import argparse
+import asyncio
+import time
+
+from common import load_app, seed
+
+
+async def watch_loop(stalls: list, interval: float = 0.005):
+    # Measures how long the event loop was blocked between ticks
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        stalls.append(time.perf_counter() - start - interval)
+
+
+async def run(args):
+    import httpx
+
+    main = load_app()
+    tokens, plate_ids = seed(main, args.clients, args.plates)
+    transport = httpx.ASGITransport(app=main.app)
+
+    scenarios = {
+        "home": lambda i: ("GET", "/", None),
+        "list_plates": lambda i: ("GET", "/plates/", None),
+        "create_bid": lambda i: ("POST", "/bids/", {
+            "plate_id": plate_ids[i % len(plate_ids)],
+            "amount": 1000 + i
+        }),
+    }
+
+    for name, make_request in scenarios.items():
+        counter = iter(range(args.requests))
+        stalls = []
+        watcher = asyncio.create_task(watch_loop(stalls))
+
+        async def client(token):
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+                http.cookies.set("token", f"Bearer {token}")
+                for i in counter:
+                    method, url, body = make_request(i)
+                    response = await http.request(method, url, json=body)
+                    if response.status_code >= 500:
+                        raise RuntimeError(f"{url} -> {response.status_code}")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client(token) for token in tokens))
+        elapsed = time.perf_counter() - start
+        watcher.cancel()
+
+        print(
+            f"{name:12s} {args.requests / elapsed:8.1f} req/s  "
+            f"max loop stall {max(stalls, default=0) * 1000:7.1f} ms"
+        )
+
+    if hasattr(main, "async_engine"):
+        await main.async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--plates", type=int, default=200)
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,76 @@
+"""create_bid write throughput under each SQLite storage profile
+
+    python benchmarks/bench_storage_profiles.py --clients 50 --bids 2000
+
+Every profile runs in its own process against a fresh database, since the
+profile is read when ``database`` is imported.
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+from common import load_app, seed
+
+
+async def run_profile(args):
+    import httpx
+
+    main = load_app()
+    tokens, plate_ids = seed(main, args.clients, args.plates)
+    transport = httpx.ASGITransport(app=main.app)
+    counter = iter(range(args.bids))
+    results = {"accepted": 0, "rejected": 0, "errors": 0}
+
+    async def client(token):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            http.cookies.set("token", f"Bearer {token}")
+            for i in counter:
+                body = {"plate_id": plate_ids[i % len(plate_ids)], "amount": 1000 + i}
+                try:
+                    response = await http.post("/bids/", json=body)
+                except Exception:
+                    results["errors"] += 1
+                    continue
+                if response.status_code == 201:
+                    results["accepted"] += 1
+                elif response.status_code < 500:
+                    results["rejected"] += 1
+                else:
+                    results["errors"] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(token) for token in tokens))
+    elapsed = time.perf_counter() - start
+    await main.async_engine.dispose()
+
+    print(
+        f"{os.environ['AUCTION_STORAGE_PROFILE']:10s} {args.bids / elapsed:8.1f} bids/s  "
+        f"accepted {results['accepted']:6d}  rejected {results['rejected']:6d}  "
+        f"errors {results['errors']:6d}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--bids", type=int, default=2000)
+    parser.add_argument("--plates", type=int, default=200)
+    parser.add_argument("--profile", help="Run a single profile in this process")
+    args = parser.parse_args()
+
+    if args.profile:
+        os.environ["AUCTION_STORAGE_PROFILE"] = args.profile
+        asyncio.run(run_profile(args))
+    else:
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        from database import STORAGE_PROFILES
+
+        for profile in STORAGE_PROFILES:
+            subprocess.run([
+                sys.executable, "-W", "ignore", __file__, "--profile", profile,
+                "--clients", str(args.clients), "--bids", str(args.bids),
+                "--plates", str(args.plates)
+            ])
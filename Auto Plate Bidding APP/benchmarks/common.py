@@ -0,0 +1,132 @@
+import asyncio
+import importlib
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Optional
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+
+def load_app(db_path: str = None):
+    """Import the app against a fresh scratch database
+
+    Must be called before anything imports ``database`` or ``main``.
+    """
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix="auction-bench-"), "bench.db")
+    os.environ["AUCTION_DATABASE_URL"] = f"sqlite:///{db_path}"
+
+    # Templates and static files are resolved relative to the app directory
+    os.chdir(APP_DIR)
+    if str(APP_DIR) not in sys.path:
+        sys.path.insert(0, str(APP_DIR))
+
+    return importlib.import_module("main")
+
+
+def seed(main, users: int, plates: int):
+    """Create users and plates directly, returns (tokens, plate_ids)"""
+    import models
+    from database import engine, SessionLocal
+
+    models.Base.metadata.create_all(bind=engine)
+    password = main.pwd_context.hash("bench")
+
+    db = SessionLocal()
+    try:
+        db_users = [
+            models.User(username=f"bench{i}", email=f"bench{i}@example.com", password=password)
+            for i in range(users)
+        ]
+        db.add_all(db_users)
+        db.flush()
+
+        deadline = datetime.now() + timedelta(days=1)
+        db_plates = [
+            models.AutoPlate(
+                plate_number=f"B{i:07d}",
+                description="Benchmark plate",
+                deadline=deadline,
+                starting_price=Decimal("1000"),
+                created_by_id=db_users[0].id,
+                is_active=True
+            )
+            for i in range(plates)
+        ]
+        db.add_all(db_plates)
+        db.commit()
+
+        tokens = [
+            main.create_access_token({"sub": user.username}, timedelta(hours=1))
+            for user in db_users
+        ]
+        return tokens, [plate.id for plate in db_plates]
+    finally:
+        db.close()
+
+
+class ASGIWebSocket:
+    """Minimal in-process WebSocket client speaking ASGI to the app
+
+    ``on_message(text, received_at)`` is called for every frame the server
+    sends, with ``time.perf_counter()`` taken on arrival.
+    """
+
+    def __init__(self, app, path: str, on_message: Optional[Callable] = None):
+        self.app = app
+        self.path = path
+        self.on_message = on_message
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.accepted = asyncio.Event()
+        self.closed = asyncio.Event()
+        self.close_code: Optional[int] = None
+        self.task: Optional[asyncio.Task] = None
+
+    async def connect(self, timeout: float = 10):
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "path": self.path,
+            "raw_path": self.path.encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [],
+            "server": ("bench", 80),
+            "client": ("127.0.0.1", 0),
+            "subprotocols": [],
+        }
+        await self.inbox.put({"type": "websocket.connect"})
+        self.task = asyncio.create_task(self.app(scope, self.inbox.get, self._send))
+        waiters = [asyncio.create_task(self.accepted.wait()), asyncio.create_task(self.closed.wait())]
+        await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        for waiter in waiters:
+            waiter.cancel()
+        if not self.accepted.is_set():
+            raise RuntimeError(f"{self.path} was not accepted (close code {self.close_code})")
+
+    async def send_text(self, text: str):
+        await self.inbox.put({"type": "websocket.receive", "text": text})
+
+    async def close(self):
+        await self.inbox.put({"type": "websocket.disconnect", "code": 1000})
+        if self.task is not None:
+            try:
+                await asyncio.wait_for(self.task, 5)
+            except Exception:
+                self.task.cancel()
+
+    async def _send(self, message: dict):
+        if message["type"] == "websocket.accept":
+            self.accepted.set()
+        elif message["type"] == "websocket.send":
+            if self.on_message is not None:
+                self.on_message(message.get("text"), time.perf_counter())
+        elif message["type"] == "websocket.close":
+            self.close_code = message.get("code", 1000)
+            self.closed.set()
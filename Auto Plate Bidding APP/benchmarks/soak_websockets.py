@@ -0,0 +1,130 @@
+"""WebSocket soak test: many open sockets must not hold database connections
+
+    python benchmarks/soak_websockets.py --sockets 10000 --plates 100
+
+Sockets are opened in batches on /ws/{plate_id}, served in-process, and
+the async engine's pool is sampled while they connect and while they sit
+idle. Connecting may check out a connection for a moment, an idle socket
+holds none, so the checked-out count has to fall back to zero whatever
+the number of sockets. Bids are then placed while every socket is open
+to check that broadcasts still reach all of them.
+"""
+import argparse
+import asyncio
+import json
+import resource
+import time
+
+from common import ASGIWebSocket, load_app, seed
+
+
+async def run(args):
+    import httpx
+
+    main = load_app()
+    from database import pool_stats
+
+    tokens, plate_ids = seed(main, 1, args.plates)
+    transport = httpx.ASGITransport(app=main.app)
+
+    snapshots = 0
+    bids = 0
+
+    def on_message(text, received_at):
+        nonlocal snapshots, bids
+        action = json.loads(text).get("action")
+        if action == "snapshot":
+            snapshots += 1
+        elif action == "new_bid":
+            bids += 1
+
+    peak = 0
+
+    async def sample_pool():
+        nonlocal peak
+        while True:
+            peak = max(peak, pool_stats()["checked_out"])
+            await asyncio.sleep(0.005)
+
+    sampler = asyncio.create_task(sample_pool())
+    sockets = []
+    failed = False
+    try:
+        start = time.perf_counter()
+        while len(sockets) < args.sockets:
+            batch = [
+                ASGIWebSocket(main.app, f"/ws/{plate_ids[i % len(plate_ids)]}", on_message)
+                for i in range(len(sockets), min(len(sockets) + args.batch, args.sockets))
+            ]
+            await asyncio.gather(*(socket.connect(timeout=60) for socket in batch))
+            sockets.extend(batch)
+            print(
+                f"{len(sockets):7d} sockets  {snapshots:7d} subscribed  "
+                f"pool checked out {pool_stats()['checked_out']:3d}  peak {peak:3d}  "
+                f"max rss {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // 1024} MB"
+            )
+        connect_elapsed = time.perf_counter() - start
+
+        # Sockets are accepted before they subscribe, wait for every snapshot
+        for _ in range(6000):
+            if snapshots >= len(sockets):
+                break
+            await asyncio.sleep(0.01)
+        subscribe_elapsed = time.perf_counter() - start
+
+        await asyncio.sleep(args.idle)
+        idle = pool_stats()
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://soak") as http:
+            http.cookies.set("token", f"Bearer {tokens[0]}")
+            for i in range(args.bids):
+                response = await http.post(
+                    "/bids/", json={"plate_id": plate_ids[i % len(plate_ids)], "amount": 1000 + i}
+                )
+                if response.status_code != 201:
+                    raise RuntimeError(f"/bids/ -> {response.status_code} {response.text}")
+
+        for _ in range(500):
+            if not main.manager.stats()["queued_messages"]:
+                break
+            await asyncio.sleep(0.01)
+        after_bids = pool_stats()
+        websocket_stats = main.manager.stats()
+    finally:
+        sampler.cancel()
+        for socket in sockets:
+            await socket.close()
+
+    # Every bid reaches the sockets of its plate
+    expected_bids = sum(
+        sum(1 for i in range(args.sockets) if i % len(plate_ids) == j % len(plate_ids))
+        for j in range(args.bids)
+    )
+    print(
+        f"opened {len(sockets)} sockets in {connect_elapsed:.2f} s, subscribed in {subscribe_elapsed:.2f} s  "
+        f"snapshots {snapshots}/{len(sockets)}  bids delivered {bids}/{expected_bids}  "
+        f"dropped {websocket_stats['dropped_messages']}"
+    )
+    print(f"pool: size {idle['size']}  peak checked out {peak}  idle {idle['checked_out']}  "
+          f"after bids {after_bids['checked_out']}  overflow {after_bids['overflow']}")
+
+    if idle["checked_out"] or after_bids["checked_out"]:
+        print("FAIL: open sockets hold database connections")
+        failed = True
+    if snapshots != len(sockets) or bids != expected_bids:
+        print("FAIL: not every socket got its messages")
+        failed = True
+
+    await main.async_engine.dispose()
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sockets", type=int, default=10000)
+    parser.add_argument("--plates", type=int, default=100)
+    parser.add_argument("--batch", type=int, default=500, help="sockets connecting at once")
+    parser.add_argument("--idle", type=float, default=1.0, help="seconds to hold every socket open")
+    parser.add_argument("--bids", type=int, default=100, help="bids placed while the sockets are open")
+    asyncio.run(run(parser.parse_args()))
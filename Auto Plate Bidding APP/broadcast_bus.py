@@ -0,0 +1,143 @@
+import asyncio
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List
+
+# Subscribers are called with (message, key, local). The key is the plate id
+# on the "plates" channel and the user id on "users". local is False for
+# messages published by another worker process.
+Subscriber = Callable[[str, int, bool], None]
+
+
+class InProcessBus:
+    """Delivers messages to subscribers of the current process only"""
+
+    def __init__(self):
+        self.subscribers: Dict[str, List[Subscriber]] = {}
+
+    def subscribe(self, callback: Subscriber, channel: str = "plates"):
+        self.subscribers.setdefault(channel, []).append(callback)
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def publish(self, message: str, plate_id: int, channel: str = "plates"):
+        self._deliver(message, plate_id, True, channel)
+
+    def _deliver(self, message: str, plate_id: int, local: bool, channel: str = "plates"):
+        for callback in self.subscribers.get(channel, ()):
+            callback(message, plate_id, local)
+
+
+class SQLiteBus(InProcessBus):
+    """Shares messages between worker processes through a SQLite event table
+
+    Every worker appends published messages to the table and polls it for
+    rows written by the other workers, so it works with
+    ``uvicorn --workers N`` on a single host without an external broker.
+    """
+
+    def __init__(self, path: str, poll_interval: float = 0.05, retention_seconds: int = 60):
+        super().__init__()
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self.origin = uuid.uuid4().hex
+        self._conn = None
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._task = None
+
+    async def start(self):
+        await asyncio.to_thread(self._open)
+        self._task = asyncio.create_task(self._poll())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    async def publish(self, message: str, plate_id: int, channel: str = "plates"):
+        # Local watchers get the message right away, the others on their next poll
+        self._deliver(message, plate_id, True, channel)
+        await asyncio.to_thread(self._insert, message, plate_id, channel)
+
+    def _open(self):
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS broadcast_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                origin TEXT NOT NULL,
+                plate_id INTEGER NOT NULL,
+                message TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                channel TEXT NOT NULL DEFAULT 'plates'
+            )
+        """)
+        # Tables created before channels existed carry plate messages only
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(broadcast_events)")]
+        if "channel" not in columns:
+            self._conn.execute("ALTER TABLE broadcast_events ADD COLUMN channel TEXT NOT NULL DEFAULT 'plates'")
+        # Only deliver messages published after this worker started
+        row = self._conn.execute("SELECT MAX(id) FROM broadcast_events").fetchone()
+        self._last_id = row[0] or 0
+
+    def _insert(self, message: str, plate_id: int, channel: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO broadcast_events (origin, plate_id, message, created_at, channel) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.origin, plate_id, message, time.time(), channel)
+            )
+
+    def _fetch(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, origin, plate_id, message, channel FROM broadcast_events WHERE id > ? ORDER BY id",
+                (self._last_id,)
+            ).fetchall()
+            if rows:
+                self._last_id = rows[-1][0]
+            return rows
+
+    def _prune(self):
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM broadcast_events WHERE created_at < ?",
+                (time.time() - self.retention_seconds,)
+            )
+
+    async def _poll(self):
+        last_prune = time.monotonic()
+        while True:
+            try:
+                for _, origin, plate_id, message, channel in await asyncio.to_thread(self._fetch):
+                    if origin != self.origin:
+                        self._deliver(message, plate_id, False, channel)
+
+                if time.monotonic() - last_prune > self.retention_seconds:
+                    await asyncio.to_thread(self._prune)
+                    last_prune = time.monotonic()
+            except sqlite3.Error as e:
+                print(f"Broadcast bus error: {e}")
+
+            await asyncio.sleep(self.poll_interval)
+
+
+def create_bus(backend: str, path: str) -> InProcessBus:
+    if backend == "memory":
+        return InProcessBus()
+    if backend == "sqlite":
+        return SQLiteBus(path)
+    raise ValueError(f"Unknown broadcast backend: {backend}")
@@ -0,0 +1,112 @@
+"""Fail if a hot auction query stops using an index
+
+Runs EXPLAIN QUERY PLAN for each query on a fresh in-memory schema built
+from models.py and exits with status 1 when a plan scans the bids table
+or sorts with a temporary B-tree.
+
+    python check_query_plans.py
+
+The same checks run with the test suite, see tests/test_query_plans.py.
+"""
+import sys
+from datetime import datetime
+
+from sqlalchemy import create_engine, func, select, tuple_
+
+import models
+import plate_search
+
+# name -> (query, plan fragments that must not appear)
+HOT_QUERIES = {
+    "highest bid of a plate": (
+        select(models.Bid).where(models.Bid.plate_id == 1)
+        .order_by(models.Bid.amount.desc()).limit(1),
+        ["SCAN bids", "USE TEMP B-TREE"],
+    ),
+    "bids of a plate by amount": (
+        select(models.Bid).where(models.Bid.plate_id == 1)
+        .order_by(models.Bid.amount.desc()),
+        ["SCAN bids", "USE TEMP B-TREE"],
+    ),
+    "bid stats of a plate": (
+        select(func.max(models.Bid.amount), func.count(models.Bid.id))
+        .where(models.Bid.plate_id == 1),
+        ["SCAN bids"],
+    ),
+    "bids of a user": (
+        select(models.Bid).where(models.Bid.user_id == 1),
+        ["SCAN bids"],
+    ),
+    "bid page of a user": (
+        select(models.Bid).where(
+            models.Bid.user_id == 1,
+            tuple_(models.Bid.created_at, models.Bid.id) < tuple_(datetime(2026, 1, 1), 1)
+        ).order_by(models.Bid.created_at.desc(), models.Bid.id.desc()).limit(51),
+        ["SCAN bids", "USE TEMP B-TREE"],
+    ),
+    "bid page of all users": (
+        select(models.Bid).where(
+            tuple_(models.Bid.created_at, models.Bid.id) < tuple_(datetime(2026, 1, 1), 1)
+        ).order_by(models.Bid.created_at.desc(), models.Bid.id.desc()).limit(51),
+        ["SCAN bids", "USE TEMP B-TREE"],
+    ),
+    "bid of a user on a plate": (
+        select(models.Bid).where(models.Bid.plate_id == 1, models.Bid.user_id == 1),
+        ["SCAN bids"],
+    ),
+    "proxy bids of a plate": (
+        select(models.ProxyBid).where(models.ProxyBid.plate_id == 1),
+        ["SCAN proxy_bids"],
+    ),
+    "active plates by deadline": (
+        select(models.AutoPlate).where(models.AutoPlate.is_active == True)
+        .order_by(models.AutoPlate.deadline.asc()),
+        ["SCAN auto_plates", "USE TEMP B-TREE"],
+    ),
+    "active plate page by deadline": (
+        select(models.AutoPlate).where(
+            models.AutoPlate.is_active == True,
+            tuple_(models.AutoPlate.deadline, models.AutoPlate.id) > tuple_(datetime(2026, 1, 1), 1)
+        ).order_by(models.AutoPlate.deadline.asc(), models.AutoPlate.id.asc()).limit(51),
+        ["SCAN auto_plates", "USE TEMP B-TREE"],
+    ),
+    # FTS5 shows index lookups as "SCAN ... VIRTUAL TABLE INDEX 0:L0" (LIKE)
+    # or "0:G0" (GLOB), the constraint after the colon is what narrows them
+    "plate number substring search": (
+        select(models.AutoPlate).where(plate_search.plate_number_condition("777")),
+        ["SCAN auto_plates"],
+    ),
+    "plate number pattern search": (
+        select(models.AutoPlate).where(plate_search.plate_number_condition(pattern="??A777*")),
+        ["SCAN auto_plates"],
+    ),
+}
+
+
+def explain(connection, query) -> list:
+    sql = str(query.compile(connection, compile_kwargs={"literal_binds": True}))
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    return [row[-1] for row in rows]
+
+
+def main() -> int:
+    engine = create_engine("sqlite://")
+    models.Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        plate_search.create_index(connection)
+
+    failures = 0
+    with engine.connect() as connection:
+        for name, (query, forbidden) in HOT_QUERIES.items():
+            plan = explain(connection, query)
+            bad = [step for step in plan if any(fragment in step for fragment in forbidden)]
+            print(f"{'FAIL' if bad else 'ok':4s} {name}: {'; '.join(plan)}")
+            failures += bool(bad)
+
+    if failures:
+        print(f"{failures} query plan(s) regressed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+import secrets
+from typing import Optional
+
+# Tags listing versions of this process, a restart or another worker
+# starts its counter from scratch and must not match old tags
+PROCESS_EPOCH = secrets.token_hex(4)
+
+
+def weak_etag(*parts) -> str:
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+class ListingVersion:
+    """Counter bumped whenever any plate or bid changes, versions plate listings
+
+    Listings depend on every active plate, so one counter is cheaper to
+    keep than a combination of per-plate versions, at the price of
+    revalidating all listings after any change.
+    """
+
+    def __init__(self):
+        self.version = 0
+
+    def bump(self):
+        self.version += 1
+
+    def etag(self) -> str:
+        return weak_etag("plates", PROCESS_EPOCH, self.version)
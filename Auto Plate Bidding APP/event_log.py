@@ -0,0 +1,111 @@
+import asyncio
+import json
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from etags import PROCESS_EPOCH
+
+# (seq, event name, JSON data)
+Event = Tuple[int, str, str]
+
+
+class PlateLog:
+    """Recent events of one plate, every event after ``floor`` is kept"""
+
+    def __init__(self, size: int, floor: int):
+        self.events: Deque[Event] = deque(maxlen=size)
+        self.floor = floor
+
+
+class PlateEventLog:
+    """Bounded ring buffers of the messages broadcast for each plate
+
+    Events are numbered from one counter for the whole process and
+    identified as ``<epoch>:<seq>``, so an id handed out by another worker
+    or an earlier run never matches. A client resuming from an id gets the
+    events it missed, or None when some of them were already dropped and
+    it has to start over from a snapshot.
+    """
+
+    def __init__(self, size: int = 256, max_plates: int = 10000):
+        self.size = size
+        self.max_plates = max_plates
+        self.epoch = PROCESS_EPOCH
+        self.seq = 0
+        self.plates: "OrderedDict[int, PlateLog]" = OrderedDict()
+        # Highest seq lost with a plate's whole buffer, newer buffers start there
+        self.evicted_floor = 0
+        self.signals: Dict[int, asyncio.Event] = {}
+        self.streams = 0
+        self.resumed = 0
+        self.snapshots = 0
+
+    def append(self, plate_id: int, message: str) -> int:
+        payload = json.loads(message)
+        name = payload.get("action") or payload.get("type") or "message"
+
+        log = self.plates.get(plate_id)
+        if log is None:
+            log = self.plates[plate_id] = PlateLog(self.size, self.evicted_floor)
+            if len(self.plates) > self.max_plates:
+                _, evicted = self.plates.popitem(last=False)
+                if evicted.events:
+                    self.evicted_floor = max(self.evicted_floor, evicted.events[-1][0])
+        else:
+            self.plates.move_to_end(plate_id)
+
+        self.seq += 1
+        if len(log.events) == log.events.maxlen:
+            log.floor = log.events[0][0]
+        log.events.append((self.seq, name, message))
+
+        signal = self.signals.pop(plate_id, None)
+        if signal is not None:
+            signal.set()
+        return self.seq
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.epoch}:{seq}"
+
+    def parse_event_id(self, event_id: str) -> Optional[int]:
+        """The seq of an id issued by this process, None for any other id"""
+        epoch, _, seq = event_id.partition(":")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        return int(seq)
+
+    def since(self, plate_id: int, seq: int) -> Optional[List[Event]]:
+        """Events of the plate after ``seq``, None if some were dropped"""
+        if seq > self.seq:
+            return None
+        log = self.plates.get(plate_id)
+        if log is None:
+            return [] if seq >= self.evicted_floor else None
+        if seq < log.floor:
+            return None
+        return [event for event in log.events if event[0] > seq]
+
+    async def wait(self, plate_id: int, seq: int, timeout: float) -> bool:
+        """Wait for an event of the plate after ``seq``, False on timeout
+
+        Returns at once when one was appended while the caller was busy,
+        so an event never waits for the timeout.
+        """
+        if self.since(plate_id, seq) != []:
+            return True
+        signal = self.signals.setdefault(plate_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(signal.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def stats(self) -> dict:
+        return {
+            "plates": len(self.plates),
+            "events": sum(len(log.events) for log in self.plates.values()),
+            "last_seq": self.seq,
+            "streams": self.streams,
+            "resumed": self.resumed,
+            "snapshots": self.snapshots,
+        }
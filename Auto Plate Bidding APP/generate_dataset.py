@@ -0,0 +1,200 @@
+"""Generate a production-sized auction dataset for performance work
+
+Rows are built as plain tuples and written with executemany in chunks, one
+transaction per chunk. Secondary indexes are dropped while loading and
+built once at the end. All users share one password hash, computed once.
+
+    python generate_dataset.py --database sqlite:///./loadtest.db \\
+        --users 100000 --plates 200000 --bids-per-plate 10 --reset
+
+Every user's password is ``--password`` (default "password"); the first
+user is the staff account "admin".
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from passlib.context import CryptContext
+from sqlalchemy import create_engine, text
+
+import models
+import plate_search
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def plate_number(index: int) -> str:
+    """Unique plate number in the 01A777AA format for index < 1.7 billion"""
+    index, tail = divmod(index, 26 * 26)
+    index, digits = divmod(index, 1000)
+    region, letter = divmod(index, 26)
+    return f"{region % 100:02d}{LETTERS[letter]}{digits:03d}{LETTERS[tail // 26]}{LETTERS[tail % 26]}"
+
+def deadline_offset(rng: random.Random, distribution: str, days: float) -> timedelta:
+    """Time from now to a plate's deadline, negative for closed auctions"""
+    if distribution == "uniform":
+        return timedelta(days=rng.uniform(-days, days))
+    if distribution == "ending-soon":
+        # Most open auctions close within hours, a long tail within days
+        return timedelta(days=min(rng.expovariate(4 / days), days))
+    # "mixed": a third closed, the rest ending soon
+    if rng.random() < 1 / 3:
+        return -timedelta(days=rng.uniform(0, days))
+    return timedelta(days=min(rng.expovariate(4 / days), days))
+
+def timestamp(value: datetime) -> str:
+    # Same text format SQLAlchemy stores, microseconds always included
+    return value.isoformat(" ", "microseconds")
+
+def insert_chunks(connection, sql: str, rows, chunk_size: int) -> int:
+    total = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            connection.exec_driver_sql(sql, chunk)
+            connection.commit()
+            total += len(chunk)
+            chunk = []
+    if chunk:
+        connection.exec_driver_sql(sql, chunk)
+        connection.commit()
+        total += len(chunk)
+    return total
+
+def generate(args):
+    rng = random.Random(args.seed)
+    engine = create_engine(args.database)
+    models.Base.metadata.create_all(bind=engine)
+
+    with engine.connect() as connection:
+        # Durability is not needed while loading
+        connection.exec_driver_sql("PRAGMA synchronous=OFF")
+        connection.exec_driver_sql("PRAGMA cache_size=-262144")
+
+        tables = ["bids", "proxy_bids", "auto_plates", "users"]
+        counts = {table: connection.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar() for table in tables}
+        if any(counts.values()):
+            if not args.reset:
+                raise SystemExit(f"Database is not empty ({counts}), pass --reset to clear it")
+            for table in tables:
+                connection.exec_driver_sql(f"DELETE FROM {table}")
+            # The trigram index is rebuilt after loading
+            connection.exec_driver_sql(f"DROP TABLE IF EXISTS {plate_search.FTS_TABLE}")
+            for trigger in ("insert", "delete", "update"):
+                connection.exec_driver_sql(f"DROP TRIGGER IF EXISTS auto_plates_fts_{trigger}")
+            connection.commit()
+
+        # Secondary indexes are cheaper to build once than to maintain per row
+        indexes = [
+            index
+            for table in (models.User.__table__, models.AutoPlate.__table__, models.Bid.__table__)
+            for index in table.indexes
+        ]
+        for index in indexes:
+            connection.exec_driver_sql(f"DROP INDEX IF EXISTS {index.name}")
+        connection.commit()
+
+        started = time.perf_counter()
+        password = CryptContext(schemes=["bcrypt"]).hash(args.password)
+        user_rows = (
+            (
+                user_id,
+                "admin" if user_id == 1 else f"user{user_id}",
+                f"user{user_id}@example.com",
+                password,
+                user_id == 1,
+            )
+            for user_id in range(1, args.users + 1)
+        )
+        users = insert_chunks(
+            connection,
+            "INSERT INTO users (id, username, email, password, is_staff) VALUES (?, ?, ?, ?, ?)",
+            user_rows,
+            args.chunk_size
+        )
+        print(f"users   {users:>10,} rows  {time.perf_counter() - started:7.2f} s")
+
+        now = datetime.now()
+        bids_per_plate = min(args.bids_per_plate, args.users)
+        plate_sql = (
+            "INSERT INTO auto_plates (id, plate_number, description, deadline, starting_price, "
+            "created_by_id, is_active, highest_bid_amount, bid_count) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        )
+        bid_sql = "INSERT INTO bids (id, amount, user_id, plate_id, created_at) VALUES (?, ?, ?, ?, ?)"
+
+        started = time.perf_counter()
+        bid_id = 0
+        total_bids = 0
+        for first_id in range(1, args.plates + 1, args.chunk_size):
+            plate_rows = []
+            bid_rows = []
+            for plate_id in range(first_id, min(first_id + args.chunk_size, args.plates + 1)):
+                deadline = now + deadline_offset(rng, args.deadline_distribution, args.deadline_days)
+                starting_price = rng.randrange(1000, 10000, 100)
+                count = rng.randint(0, 2 * bids_per_plate) if bids_per_plate else 0
+                count = min(count, args.users)
+
+                # Bids of a plate are generated with it, so the plate row carries its stats
+                amount = starting_price
+                # Bids fall in the week before the deadline, or before now while open
+                end = min(deadline, now)
+                offsets = sorted(rng.random() for _ in range(count))
+                for user_id, offset in zip(rng.sample(range(1, args.users + 1), count), offsets):
+                    bid_id += 1
+                    amount += 100 * int(1 + 49 * rng.random())
+                    bid_time = end - timedelta(days=7 * (1 - offset))
+                    bid_rows.append((bid_id, f"{amount}.00", user_id, plate_id, timestamp(bid_time)))
+
+                number = plate_number(plate_id)
+                plate_rows.append((
+                    plate_id,
+                    number,
+                    f"Avto raqam {number}",
+                    timestamp(deadline),
+                    f"{starting_price}.00",
+                    1,
+                    deadline > now,
+                    f"{amount}.00" if count else None,
+                    count,
+                ))
+
+            # One transaction per chunk of plates and their bids
+            connection.exec_driver_sql(plate_sql, plate_rows)
+            if bid_rows:
+                connection.exec_driver_sql(bid_sql, bid_rows)
+            connection.commit()
+            total_bids += len(bid_rows)
+
+        elapsed = time.perf_counter() - started
+        print(f"plates  {args.plates:>10,} rows")
+        print(f"bids    {total_bids:>10,} rows  {elapsed:7.2f} s for plates and bids")
+
+        started = time.perf_counter()
+        for index in indexes:
+            index.create(connection)
+        plate_search.create_index(connection)
+        connection.exec_driver_sql("ANALYZE")
+        connection.commit()
+        print(f"indexes, search index and ANALYZE  {time.perf_counter() - started:7.2f} s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database", default="sqlite:///./loadtest.db", help="SQLAlchemy URL")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--plates", type=int, default=50000)
+    parser.add_argument("--bids-per-plate", type=int, default=10, help="mean, actual count is 0..2x")
+    parser.add_argument(
+        "--deadline-distribution", choices=["uniform", "ending-soon", "mixed"], default="mixed"
+    )
+    parser.add_argument("--deadline-days", type=float, default=30, help="spread of deadlines")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="rows per transaction")
+    parser.add_argument("--password", default="password")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--reset", action="store_true", help="delete existing rows first")
+    args = parser.parse_args()
+    if args.users < 1:
+        parser.error("--users must be at least 1")
+    generate(args)
@@ -1,12 +1,16 @@
 # main.py
-from fastapi import FastAPI, Depends, HTTPException, WebSocket, WebSocketDisconnect, Request, Form, status
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi import FastAPI, Depends, HTTPException, WebSocket, WebSocketDisconnect, Request, Form, Query, Response, status
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
+from sqlalchemy import event, func, inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.exc import StaleDataError
 from sqlalchemy.exc import IntegrityError
-from typing import List, Optional, Dict, Any
+from pydantic import ValidationError
+from typing import List, Optional, Any
 from datetime import datetime, timedelta
 from decimal import Decimal  # Add this import
 import jwt
@@ -14,15 +18,29 @@ import uvicorn
 import json
 from pathlib import Path
 import asyncio
+import os
 
 # Import database models and schemas
-from database import SessionLocal, engine
+from database import SessionLocal, AsyncSessionLocal, engine, async_engine, pool_stats
 import models
 import schemas
+from order_book import OrderBook, BidRejected, StaleBook
+from websocket_manager import ConnectionManager
+from broadcast_bus import create_bus
+from password_hasher import PasswordHasher, HasherBusy
+from auth_cache import AuthCache, UserSnapshot
+from auction_scheduler import AuctionScheduler
+from page_cache import PageCache
+from etags import ListingVersion, etag_matches, weak_etag
+from event_log import PlateEventLog
+import plate_search
+from pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursor, decode_cursor, keyset, split_page
 from passlib.context import CryptContext
 
 # Create database tables
 models.Base.metadata.create_all(bind=engine)
+with engine.begin() as connection:
+    plate_search.create_index(connection)
 
 app = FastAPI(title="Avto Raqamlar Auktsioni")
 
@@ -36,50 +54,195 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 1 day
 
 # Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = int(os.getenv("AUCTION_BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("AUCTION_PASSWORD_HASH_WORKERS", "4"))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("AUCTION_PASSWORD_HASH_MAX_PENDING", "64"))
+# Re-hash stored passwords on login when BCRYPT_ROUNDS changes
+PASSWORD_REHASH_ON_LOGIN = os.getenv("AUCTION_PASSWORD_REHASH_ON_LOGIN", "0") == "1"
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+# bcrypt runs in a bounded thread pool, never on the event loop
+password_hasher = PasswordHasher(
+    pwd_context,
+    max_workers=PASSWORD_HASH_WORKERS,
+    max_pending=PASSWORD_HASH_MAX_PENDING,
+    rehash_on_login=PASSWORD_REHASH_ON_LOGIN
+)
 
 # OAuth2 setup
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
+# Authenticated-user cache: token -> user snapshot
+AUTH_CACHE_SIZE = int(os.getenv("AUCTION_AUTH_CACHE_SIZE", "10000"))
+AUTH_CACHE_TTL_SECONDS = int(os.getenv("AUCTION_AUTH_CACHE_TTL", "60"))
+auth_cache = AuthCache(max_size=AUTH_CACHE_SIZE, ttl_seconds=AUTH_CACHE_TTL_SECONDS)
+
+def forget_cached_user(mapper, connection, target):
+    # Drop cached tokens of a changed user, under the old username too
+    usernames = {target.username, *(inspect(target).attrs.username.history.deleted or ())}
+    for username in usernames:
+        auth_cache.invalidate_user(username)
+    # Every worker drops them again once the change is committed
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("changed_users", {}).setdefault(target.id, set()).update(usernames)
+
+def announce_changed_users(session):
+    changed = session.info.pop("changed_users", None)
+    if not changed:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # Scripts run outside the app, there are no workers to tell
+        return
+    for user_id, usernames in changed.items():
+        message = json.dumps({"action": "user_changed", "user_id": user_id, "usernames": sorted(usernames)})
+        loop.create_task(manager.bus.publish(message, user_id, channel="users"))
+
+def discard_changed_users(session):
+    session.info.pop("changed_users", None)
+
+event.listen(models.User, "after_update", forget_cached_user)
+event.listen(models.User, "after_delete", forget_cached_user)
+event.listen(Session, "after_commit", announce_changed_users)
+event.listen(Session, "after_rollback", discard_changed_users)
+
+# WebSocket settings
+WS_SEND_QUEUE_SIZE = 100  # Messages buffered per connection
+WS_OVERFLOW_POLICY = "drop"  # "drop" oldest message or "disconnect" slow client
+# Plates one /ws socket may subscribe to
+WS_MAX_SUBSCRIPTIONS = int(os.getenv("AUCTION_WS_MAX_SUBSCRIPTIONS", "100"))
+# Merge bid messages of a plate arriving within this many milliseconds, 0 is off
+WS_COALESCE_MS = int(os.getenv("AUCTION_WS_COALESCE_MS", "0"))
+# Ping every socket this often, 0 is off. With a timeout, sockets not answering
+# within it are dropped: only enable it for clients that answer pings
+WS_PING_INTERVAL = float(os.getenv("AUCTION_WS_PING_INTERVAL", "0"))
+WS_PING_TIMEOUT = float(os.getenv("AUCTION_WS_PING_TIMEOUT", "0"))
+# Protocol pings sent by uvicorn (websockets implementation), which every
+# client answers: a peer silent past the timeout is closed and disconnected
+# from the manager, so dead sockets are reaped with the heartbeat above off.
+# Started from the command line, pass the same values to uvicorn:
+#   uvicorn main:app --ws websockets --ws-ping-interval 20 --ws-ping-timeout 20
+UVICORN_WS_PING_INTERVAL = float(os.getenv("AUCTION_UVICORN_WS_PING_INTERVAL", "20"))
+UVICORN_WS_PING_TIMEOUT = float(os.getenv("AUCTION_UVICORN_WS_PING_TIMEOUT", "20"))
+
+# Broadcast bus: "memory" for a single worker, "sqlite" to share
+# live updates between uvicorn workers on the same host
+BROADCAST_BACKEND = os.getenv("AUCTION_BROADCAST_BACKEND", "memory")
+BROADCAST_DB_PATH = os.getenv("AUCTION_BROADCAST_DB", "./broadcast.db")
+
 # WebSocket connection manager
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[int, List[WebSocket]] = {}
-
-    async def connect(self, websocket: WebSocket, plate_id: int):
-        await websocket.accept()
-        if plate_id not in self.active_connections:
-            self.active_connections[plate_id] = []
-        self.active_connections[plate_id].append(websocket)
-
-    def disconnect(self, websocket: WebSocket, plate_id: int):
-        if plate_id in self.active_connections:
-            if websocket in self.active_connections[plate_id]:
-                self.active_connections[plate_id].remove(websocket)
-            if not self.active_connections[plate_id]:
-                del self.active_connections[plate_id]
-
-    async def broadcast(self, message: str, plate_id: int):
-        if plate_id in self.active_connections:
-            for connection in self.active_connections[plate_id]:
-                await connection.send_text(message)
-
-manager = ConnectionManager()
+manager = ConnectionManager(
+    max_queue_size=WS_SEND_QUEUE_SIZE,
+    overflow_policy=WS_OVERFLOW_POLICY,
+    bus=create_bus(BROADCAST_BACKEND, BROADCAST_DB_PATH),
+    coalesce_window=WS_COALESCE_MS / 1000,
+    ping_interval=WS_PING_INTERVAL,
+    ping_timeout=WS_PING_TIMEOUT
+)
+
+# In-memory order books for the bid hot path, bids on a plate are
+# admitted one at a time under one of BID_LOCK_SHARDS locks
+BID_LOCK_SHARDS = int(os.getenv("AUCTION_BID_LOCK_SHARDS", "256"))
+order_book = OrderBook(lock_shards=BID_LOCK_SHARDS)
+
+# Step by which proxy bids outbid their rivals
+BID_INCREMENT = Decimal(os.getenv("AUCTION_BID_INCREMENT", "100"))
+# Largest list accepted by POST /bids/batch
+BID_BATCH_MAX_SIZE = int(os.getenv("AUCTION_BID_BATCH_MAX_SIZE", "100"))
+
+def forget_remote_plate(message: str, plate_id: int, local: bool):
+    # Another worker changed the plate, reload its order book on next use
+    if not local:
+        order_book.discard(plate_id)
+
+manager.bus.subscribe(forget_remote_plate)
+
+def forget_changed_user(message: str, user_id: int, local: bool):
+    # Deleted, deactivated or demoted users must not stay authenticated
+    # through another worker's cache
+    for username in json.loads(message)["usernames"]:
+        auth_cache.invalidate_user(username)
+
+manager.bus.subscribe(forget_changed_user, channel="users")
+
+# Rendered HTML of pages that only change with plates and bids
+PAGE_CACHE_SIZE = int(os.getenv("AUCTION_PAGE_CACHE_SIZE", "1000"))
+PAGE_CACHE_MAX_BYTES = int(os.getenv("AUCTION_PAGE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+page_cache = PageCache(max_entries=PAGE_CACHE_SIZE, max_bytes=PAGE_CACHE_MAX_BYTES)
+
+# ETag of the plate listings, single plates are tagged with their version
+listing_version = ListingVersion()
+
+def plate_changed(plate_id: int):
+    """Drop rendered pages of the plate and revalidate every listing"""
+    page_cache.invalidate_plate(plate_id)
+    listing_version.bump()
+
+def forget_rendered_plate(message: str, plate_id: int, local: bool):
+    # Every broadcast means the plate or its bids changed
+    plate_changed(plate_id)
+
+manager.bus.subscribe(forget_rendered_plate)
+
+# Recent events of each plate, replayed to SSE clients that reconnect
+EVENT_LOG_SIZE = int(os.getenv("AUCTION_EVENT_LOG_SIZE", "256"))  # Events kept per plate
+EVENT_LOG_MAX_PLATES = int(os.getenv("AUCTION_EVENT_LOG_MAX_PLATES", "10000"))
+SSE_KEEPALIVE_SECONDS = float(os.getenv("AUCTION_SSE_KEEPALIVE", "15"))
+SSE_RETRY_MS = 3000  # Reconnect delay suggested to EventSource clients
+event_log = PlateEventLog(size=EVENT_LOG_SIZE, max_plates=EVENT_LOG_MAX_PLATES)
+
+def record_plate_event(message: str, plate_id: int, local: bool):
+    event_log.append(plate_id, message)
+
+manager.bus.subscribe(record_plate_event)
+
+def plate_etag(plate_id: int, version: int) -> str:
+    return weak_etag("plate", plate_id, version)
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+def page_cache_key(request: Request, *parts) -> str:
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return ":".join([request.url.path, query, *map(str, parts)])
+
+def cached_page(key: str) -> Optional[HTMLResponse]:
+    body = page_cache.get(key)
+    if body is None:
+        return None
+    return HTMLResponse(content=body, headers={"X-Cache": "HIT"})
+
+async def announce_closed_plates(closed: List[dict]):
+    for plate in closed:
+        # Closing bumped the plate's version, a later bid reloads the book
+        order_book.discard(plate["plate_id"])
+
+        close_message = {"action": "plate_closed", **plate}
+        await manager.broadcast(json.dumps(close_message), plate["plate_id"])
+
+# Closes auctions as their deadlines pass
+auction_scheduler = AuctionScheduler(AsyncSessionLocal, announce_closed_plates)
+
+def schedule_plate(plate: models.AutoPlate):
+    if plate.is_active:
+        auction_scheduler.schedule(plate.id, plate.deadline)
+    else:
+        auction_scheduler.unschedule(plate.id)
 
 # Database dependency
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 # Authentication helper functions
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password, hashed_password):
+    return await password_hasher.verify(plain_password, hashed_password)
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def get_password_hash(password):
+    return await password_hasher.hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -91,44 +254,245 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_user_by_username(db: Session, username: str):
-    return db.query(models.User).filter(models.User.username == username).first()
+async def get_user_by_username(db: AsyncSession, username: str):
+    return await db.scalar(select(models.User).where(models.User.username == username))
+
+async def get_active_plates(
+    db: AsyncSession,
+    ordering: Optional[str] = None,
+    plate_number__contains: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    plate_number__pattern: Optional[str] = None
+):
+    """Return one page of active plates and the cursor of the next page"""
+    # Highest bid and bid count are stored on the plate, so one query is enough
+    query = select(models.AutoPlate).where(models.AutoPlate.is_active == True)
+    
+    # Filter by plate number if provided, through the trigram index
+    search = plate_search.plate_number_condition(plate_number__contains, plate_number__pattern)
+    if search is not None:
+        query = query.where(search)
+    
+    # Apply ordering (default is deadline ascending), the id breaks ties
+    order = "-deadline" if ordering == "-deadline" else "deadline"
+    after = decode_cursor(cursor, datetime, int, order=order) if cursor else None
+    query = keyset(
+        query,
+        [models.AutoPlate.deadline, models.AutoPlate.id],
+        after,
+        limit,
+        descending=order == "-deadline"
+    )
+    
+    plates = (await db.scalars(query)).all()
+    return split_page(plates, limit, lambda plate: (plate.deadline, plate.id), order=order)
+
+def plate_with_highest_bid(plate: models.AutoPlate) -> schemas.AutoPlateWithHighestBid:
+    # Not validated: the create-time deadline check would reject ended auctions
+    return schemas.AutoPlateWithHighestBid.model_construct(
+        id=plate.id,
+        plate_number=plate.plate_number,
+        description=plate.description,
+        deadline=plate.deadline,
+        starting_price=plate.starting_price,
+        created_by_id=plate.created_by_id,
+        is_active=plate.is_active,
+        snipe_window_seconds=plate.snipe_window_seconds,
+        snipe_extension_seconds=plate.snipe_extension_seconds,
+        highest_bid=plate.highest_bid_amount,
+        bid_count=plate.bid_count
+    )
+
+def next_page_url(request: Request, next_cursor: Optional[str]) -> Optional[str]:
+    if not next_cursor:
+        return None
+    return str(request.url.include_query_params(cursor=next_cursor))
+
+async def write_plate_bid_stats(db: AsyncSession, book, **values):
+    """Update the plate row and bump its version, if the book is still current
+
+    The version check makes a bid's read-compare-write atomic across
+    workers, within one worker order_book.lock() already serializes it.
+    Raises StaleBook when another writer got there first.
+    """
+    result = await db.execute(
+        update(models.AutoPlate)
+        .where(models.AutoPlate.id == book.plate_id, models.AutoPlate.version == book.version)
+        .values(version=models.AutoPlate.version + 1, **values)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        order_book.version_conflicts += 1
+        raise StaleBook(f"Plate {book.plate_id} changed concurrently")
+    book.version += 1
+
+async def refresh_plate_bid_stats(db: AsyncSession, book):
+    # Recompute the denormalized stats inside the caller's transaction
+    result = await db.execute(
+        select(func.max(models.Bid.amount), func.count(models.Bid.id))
+        .where(models.Bid.plate_id == book.plate_id)
+    )
+    highest_amount, bid_count = result.one()
+    
+    await write_plate_bid_stats(db, book, highest_bid_amount=highest_amount, bid_count=bid_count)
+
+async def save_bid(db: AsyncSession, book, user_id: int, amount: Decimal, now: datetime):
+    """Insert the user's bid on the plate or raise it, returns (bid_id, is_new)"""
+    existing = book.user_bids.get(user_id)
+    if existing:
+        await db.execute(
+            update(models.Bid)
+            .where(models.Bid.id == existing[0])
+            .values(amount=amount, created_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        return existing[0], False
+
+    db_bid = models.Bid(amount=amount, user_id=user_id, plate_id=book.plate_id, created_at=now)
+    db.add(db_bid)
+    await db.flush()
+    return db_bid.id, True
+
+async def broadcast_proxy_bid(db: AsyncSession, plate_id: int, user_id: int, amount: Decimal, now: datetime):
+    username = await db.scalar(select(models.User.username).where(models.User.id == user_id))
+    bid_update = {
+        "action": "new_bid",
+        "plate_id": plate_id,
+        "bid_amount": float(amount),
+        "bidder_id": user_id,
+        "bidder_username": username,
+        "proxy": True,
+        "timestamp": now.isoformat()
+    }
+    await manager.broadcast(json.dumps(bid_update), plate_id)
 
-def authenticate_user(db: Session, username: str, password: str):
-    user = get_user_by_username(db, username)
+async def extend_deadline_for_late_bid(db: AsyncSession, book, now: datetime) -> Optional[datetime]:
+    # Anti-sniping: a bid in the plate's final window pushes the deadline out
+    new_deadline = book.extended_deadline(now)
+    if new_deadline:
+        await db.execute(
+            update(models.AutoPlate)
+            .where(models.AutoPlate.id == book.plate_id)
+            .values(deadline=new_deadline)
+            .execution_options(synchronize_session=False)
+        )
+    return new_deadline
+
+async def announce_deadline_extension(book, new_deadline: datetime):
+    book.deadline = new_deadline
+    auction_scheduler.schedule(book.plate_id, new_deadline)
+
+    extension_message = {
+        "action": "deadline_extended",
+        "plate_id": book.plate_id,
+        "deadline": new_deadline.isoformat(),
+        "timestamp": datetime.now().isoformat()
+    }
+    await manager.broadcast(json.dumps(extension_message), book.plate_id)
+
+async def authenticate_user(db: AsyncSession, username: str, password: str):
+    user = await get_user_by_username(db, username)
     if not user:
         return False
-    if not verify_password(password, user.password):
+    valid, new_hash = await password_hasher.verify_and_update(password, user.password)
+    if not valid:
         return False
+    if new_hash:
+        # The bcrypt cost changed since this password was stored
+        user.password = new_hash
+        await db.commit()
+    return user
+
+async def get_user_from_token(db: AsyncSession, token: str) -> Optional[UserSnapshot]:
+    # Cached tokens skip both JWT decoding and the user query
+    user = auth_cache.get(token)
+    if user is not None:
+        return user
+    
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    username = payload.get("sub")
+    if not username:
+        return None
+    
+    db_user = await get_user_by_username(db, username)
+    if not db_user:
+        return None
+    
+    user = UserSnapshot.from_user(db_user)
+    auth_cache.put(token, user, payload.get("exp"))
     return user
 
 async def get_current_user(
     request: Request,
-    db: Session = Depends(get_db)
-) -> models.User:
+    db: AsyncSession = Depends(get_db)
+) -> Optional[UserSnapshot]:
     try:
         token = request.cookies.get("token")
         if not token or not token.startswith("Bearer "):
             return None
             
         token = token.split("Bearer ")[1]
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username = payload.get("sub")
-        if not username:
-            return None
-            
-        user = get_user_by_username(db, username)
-        return user
+        return await get_user_from_token(db, token)
     except:
         return None
 
+@app.on_event("startup")
+async def hydrate_order_book():
+    async with AsyncSessionLocal() as db:
+        await order_book.hydrate(db)
+
+@app.on_event("startup")
+async def start_broadcast_bus():
+    await manager.bus.start()
+
+@app.on_event("startup")
+async def start_websocket_heartbeat():
+    await manager.start()
+
+@app.on_event("startup")
+async def start_auction_scheduler():
+    await auction_scheduler.start()
+
+@app.on_event("shutdown")
+async def stop_auction_scheduler():
+    await auction_scheduler.stop()
+
+@app.on_event("shutdown")
+async def stop_websocket_heartbeat():
+    await manager.stop()
+
+@app.on_event("shutdown")
+async def stop_broadcast_bus():
+    await manager.bus.stop()
+
+@app.on_event("shutdown")
+async def close_database():
+    await async_engine.dispose()
+
+@app.on_event("shutdown")
+def stop_password_hasher():
+    password_hasher.shutdown()
+
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    return JSONResponse(status_code=400, content={"detail": str(exc)})
+
+@app.exception_handler(HasherBusy)
+async def hasher_busy_handler(request: Request, exc: HasherBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Too many login attempts, try again shortly"},
+        headers={"Retry-After": "1"}
+    )
+
 # User registration
 @app.post("/register", response_model=schemas.UserResponse)
-def register_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    db_user = get_user_by_username(db, username=user.username)
+async def register_user(user: schemas.UserCreate, db: AsyncSession = Depends(get_db)):
+    db_user = await get_user_by_username(db, username=user.username)
     if db_user:
         raise HTTPException(status_code=400, detail="Username already registered")
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash(user.password)
     new_user = models.User(
         username=user.username,
         email=user.email,
@@ -136,14 +500,14 @@ def register_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
         is_staff=user.is_staff if hasattr(user, 'is_staff') else False
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     return new_user
 
 # Login endpoint
 @app.post("/login", response_model=schemas.Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = authenticate_user(db, form_data.username, form_data.password)
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -158,55 +522,35 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
 
 # Auto Plate Endpoints
 @app.get("/plates/", response_model=List[schemas.AutoPlateWithHighestBid])
-def list_plates(
+async def list_plates(
+    request: Request,
+    response: Response,
     ordering: Optional[str] = None,
     plate_number__contains: Optional[str] = None,
-    db: Session = Depends(get_db)
+    plate_number__pattern: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db)
 ):
-    # Base query
-    query = db.query(models.AutoPlate).filter(models.AutoPlate.is_active == True)
-    
-    # Filter by plate number if provided
-    if plate_number__contains:
-        query = query.filter(models.AutoPlate.plate_number.ilike(f"%{plate_number__contains}%"))
-    
-    # Apply ordering
-    if ordering:
-        if ordering == "deadline":
-            query = query.order_by(models.AutoPlate.deadline.asc())
-        elif ordering == "-deadline":
-            query = query.order_by(models.AutoPlate.deadline.desc())
-    else:
-        # Default ordering by deadline ascending
-        query = query.order_by(models.AutoPlate.deadline.asc())
-    
-    # Execute query
-    plates = query.all()
-    result = []
+    # Taken before querying, a change during the query only costs a refetch
+    etag = listing_version.etag()
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag)
     
-    # Add highest bids
-    for plate in plates:
-        highest_bid = db.query(models.Bid).filter(
-            models.Bid.plate_id == plate.id
-        ).order_by(models.Bid.amount.desc()).first()
-        
-        plate_with_bid = schemas.AutoPlateWithHighestBid(
-            id=plate.id,
-            plate_number=plate.plate_number,
-            description=plate.description,
-            deadline=plate.deadline,
-            is_active=plate.is_active,
-            highest_bid=highest_bid.amount if highest_bid else None
-        )
-        result.append(plate_with_bid)
-    
-    return result
+    plates, next_cursor = await get_active_plates(
+        db, ordering, plate_number__contains, cursor, limit, plate_number__pattern
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return [plate_with_highest_bid(plate) for plate in plates]
 
 @app.post("/plates/", response_model=schemas.AutoPlateResponse, status_code=201)
-def create_plate(
+async def create_plate(
     plate: schemas.AutoPlateCreate,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if not current_user.is_staff:
         raise HTTPException(status_code=403, detail="Not authorized to create plates")
@@ -216,9 +560,9 @@ def create_plate(
         raise HTTPException(status_code=400, detail="Deadline must be in the future")
     
     # Check if plate number is unique
-    existing_plate = db.query(models.AutoPlate).filter(
-        models.AutoPlate.plate_number == plate.plate_number
-    ).first()
+    existing_plate = await db.scalar(
+        select(models.AutoPlate).where(models.AutoPlate.plate_number == plate.plate_number)
+    )
     
     if existing_plate:
         raise HTTPException(status_code=400, detail="Plate number already exists")
@@ -227,187 +571,471 @@ def create_plate(
         plate_number=plate.plate_number,
         description=plate.description,
         deadline=plate.deadline,
+        snipe_window_seconds=plate.snipe_window_seconds,
+        snipe_extension_seconds=plate.snipe_extension_seconds,
         created_by_id=current_user.id,
         is_active=True
     )
     
     db.add(db_plate)
     try:
-        db.commit()
-        db.refresh(db_plate)
+        await db.commit()
+        await db.refresh(db_plate)
+        schedule_plate(db_plate)
+        plate_changed(db_plate.id)
         return db_plate
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail="Error creating plate")
 
 @app.get("/plates/{plate_id}", response_model=schemas.AutoPlateWithBids)
-def get_plate(plate_id: int, db: Session = Depends(get_db)):
-    plate = db.query(models.AutoPlate).filter(models.AutoPlate.id == plate_id).first()
+async def get_plate(
+    plate_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
+):
+    # Plates with an order book are revalidated without the database
+    if_none_match = request.headers.get("if-none-match")
+    book = order_book.plates.get(plate_id)
+    if book is not None and etag_matches(if_none_match, plate_etag(plate_id, book.version)):
+        return not_modified(plate_etag(plate_id, book.version))
+    
+    plate = await db.get(models.AutoPlate, plate_id)
     if not plate:
         raise HTTPException(status_code=404, detail="Plate not found")
     
-    bids = db.query(models.Bid).filter(models.Bid.plate_id == plate_id).all()
+    etag = plate_etag(plate.id, plate.version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    bids = (await db.scalars(select(models.Bid).where(models.Bid.plate_id == plate_id))).all()
     
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
     return {
         "id": plate.id,
         "plate_number": plate.plate_number,
         "description": plate.description,
         "deadline": plate.deadline,
+        "starting_price": plate.starting_price,
+        "snipe_window_seconds": plate.snipe_window_seconds,
+        "snipe_extension_seconds": plate.snipe_extension_seconds,
+        "created_by_id": plate.created_by_id,
         "is_active": plate.is_active,
         "bids": bids
     }
 
-def update_plate(
+async def update_plate(
     plate_id: int,
     plate_update: schemas.AutoPlateUpdate,
     current_user: models.User,
-    db: Session
+    db: AsyncSession
 ):
     if not current_user.is_staff:
         raise HTTPException(status_code=403, detail="Not authorized to update plates")
     
-    db_plate = db.query(models.AutoPlate).filter(models.AutoPlate.id == plate_id).first()
-    if not db_plate:
-        raise HTTPException(status_code=404, detail="Plate not found")
-    
-    # Update plate fields
-    db_plate.plate_number = plate_update.plate_number
-    db_plate.description = plate_update.description
-    db_plate.deadline = plate_update.deadline
-    db_plate.is_active = plate_update.is_active
-    
-    try:
-        db.commit()
-        
-        # Create update message
-        update_message = {
-            "type": "plate_update",
-            "plate_id": db_plate.id,
-            "plate_number": db_plate.plate_number,
-            "description": db_plate.description,
-            "deadline": db_plate.deadline.isoformat(),
-            "is_active": db_plate.is_active
-        }
+    # Bids on the plate wait, so they cannot change its version meanwhile
+    async with order_book.lock(plate_id, db=db):
+        db_plate = await db.get(models.AutoPlate, plate_id)
+        if not db_plate:
+            raise HTTPException(status_code=404, detail="Plate not found")
         
-        # Pass plate_id to broadcast
-        asyncio.create_task(manager.broadcast(json.dumps(update_message), db_plate.id))
+        # Update plate fields
+        db_plate.plate_number = plate_update.plate_number
+        db_plate.description = plate_update.description
+        db_plate.deadline = plate_update.deadline
+        db_plate.snipe_window_seconds = plate_update.snipe_window_seconds
+        db_plate.snipe_extension_seconds = plate_update.snipe_extension_seconds
+        db_plate.is_active = plate_update.is_active
         
-        return db_plate
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=400, detail=str(e))
+        try:
+            await db.commit()
+            order_book.update_plate(db_plate)
+            schedule_plate(db_plate)
+            plate_changed(db_plate.id)
+            
+            # Create update message
+            update_message = {
+                "type": "plate_update",
+                "plate_id": db_plate.id,
+                "plate_number": db_plate.plate_number,
+                "description": db_plate.description,
+                "deadline": db_plate.deadline.isoformat(),
+                "snipe_window_seconds": db_plate.snipe_window_seconds,
+                "snipe_extension_seconds": db_plate.snipe_extension_seconds,
+                "is_active": db_plate.is_active
+            }
+            
+            # Pass plate_id to broadcast
+            asyncio.create_task(manager.broadcast(json.dumps(update_message), db_plate.id))
+            
+            return db_plate
+        except Exception as e:
+            await db.rollback()
+            raise HTTPException(status_code=400, detail=str(e))
 
 @app.delete("/plates/{plate_id}", status_code=204)
-def delete_plate(
+async def delete_plate(
     plate_id: int,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if not current_user.is_staff:
         raise HTTPException(status_code=403, detail="Not authorized to delete plates")
     
-    db_plate = db.query(models.AutoPlate).filter(models.AutoPlate.id == plate_id).first()
-    if not db_plate:
-        raise HTTPException(status_code=404, detail="Plate not found")
-    
-    # Check if plate has bids
-    bids_count = db.query(models.Bid).filter(models.Bid.plate_id == plate_id).count()
-    if bids_count > 0:
-        raise HTTPException(status_code=400, detail="Cannot delete plate with active bids")
-    
-    db.delete(db_plate)
-    db.commit()
+    # Bids on the plate wait, a bid from another worker bumps the version
+    async with order_book.lock(plate_id, db=db):
+        db_plate = await db.get(models.AutoPlate, plate_id)
+        if not db_plate:
+            raise HTTPException(status_code=404, detail="Plate not found")
+        
+        # Check if plate has bids
+        bids_count = await db.scalar(
+            select(func.count(models.Bid.id)).where(models.Bid.plate_id == plate_id)
+        )
+        if bids_count > 0:
+            raise HTTPException(status_code=400, detail="Cannot delete plate with active bids")
+        
+        try:
+            await db.delete(db_plate)
+            await db.commit()
+        except (IntegrityError, StaleDataError):
+            await db.rollback()
+            order_book.discard(plate_id)
+            raise HTTPException(status_code=409, detail="Plate changed concurrently, please retry")
+        order_book.discard(plate_id)
+    auction_scheduler.unschedule(plate_id)
+    plate_changed(plate_id)
     
     return None
 
 # Bid Endpoints
 @app.get("/bids/", response_model=List[schemas.BidResponse])
-def list_user_bids(
+async def list_user_bids(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    bids = db.query(models.Bid).filter(models.Bid.user_id == current_user.id).all()
+    # Newest first
+    query = keyset(
+        select(models.Bid).where(models.Bid.user_id == current_user.id),
+        [models.Bid.created_at, models.Bid.id],
+        decode_cursor(cursor, datetime, int) if cursor else None,
+        limit,
+        descending=True
+    )
+    bids, next_cursor = split_page(
+        (await db.scalars(query)).all(), limit, lambda bid: (bid.created_at, bid.id)
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return bids
 
+async def _place_bid(
+    db: AsyncSession, book, user, amount: Decimal, now: datetime, extend_deadline: bool = True
+) -> dict:
+    """Validate and write one bid without committing
+
+    Raises BidRejected before writing anything. The order book is updated
+    as soon as the rows are written so that later bids of the same
+    transaction see it; callers must discard the book if the commit fails.
+    Returns the bid response, the new_bid message and the new deadline,
+    the deadline is left alone when ``extend_deadline`` is false.
+    """
+    book.check_bid(user.id, amount, now)
+    
+    # Proxies outbidding this bid answer in the same transaction
+    proxy_bids = book.resolve_proxies(user.id, amount, BID_INCREMENT)
+    if proxy_bids and proxy_bids[-1][0] == user.id:
+        # The bidder's own proxy competes with other ones, bid at its price
+        amount = proxy_bids.pop()[1]
+    
+    bid_id, is_new = await save_bid(db, book, user.id, amount, now)
+    book.apply_bid(bid_id, user.id, amount)
+    new_bids = int(is_new)
+    for proxy_user_id, proxy_amount in proxy_bids:
+        proxy_bid_id, proxy_is_new = await save_bid(db, book, proxy_user_id, proxy_amount, now)
+        book.apply_bid(proxy_bid_id, proxy_user_id, proxy_amount)
+        new_bids += int(proxy_is_new)
+    
+    top_user_id, top_amount, top_username = book.top_user_id, book.top_amount, user.username
+    if top_user_id != user.id:
+        top_username = await db.scalar(
+            select(models.User.username).where(models.User.id == top_user_id)
+        )
+    
+    # The accepted bid or a proxy answering it is the new highest one
+    await write_plate_bid_stats(
+        db, book,
+        highest_bid_amount=top_amount,
+        bid_count=models.AutoPlate.bid_count + new_bids
+    )
+    new_deadline = await extend_deadline_for_late_bid(db, book, now) if extend_deadline else None
+    if new_deadline:
+        book.deadline = new_deadline
+    
+    return {
+        "bid": schemas.BidResponse(
+            id=bid_id,
+            amount=amount,
+            user_id=user.id,
+            plate_id=book.plate_id,
+            created_at=now
+        ),
+        # Announces the resulting price, which a proxy may have set
+        "message": {
+            "action": "new_bid",
+            "plate_id": book.plate_id,
+            "bid_amount": float(top_amount),
+            "bidder_id": top_user_id,
+            "bidder_username": top_username,
+            "proxy": top_user_id != user.id,
+            "timestamp": now.isoformat()
+        },
+        "new_deadline": new_deadline,
+    }
+
 @app.post("/bids/", response_model=schemas.BidResponse, status_code=201)
 async def create_bid(
     bid: schemas.BidCreate,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     # Check if amount is positive
     if bid.amount <= 0:
         raise HTTPException(status_code=400, detail="Bid amount must be positive")
     
-    # Check if plate exists and is active
-    plate = db.query(models.AutoPlate).filter(models.AutoPlate.id == bid.plate_id).first()
-    if not plate:
-        raise HTTPException(status_code=404, detail="Plate not found")
-    
-    if not plate.is_active:
-        raise HTTPException(status_code=400, detail="Auction is closed")
+    # Match the precision of the amount column
+    bid.amount = bid.amount.quantize(Decimal("0.01"))
     
-    if plate.deadline <= datetime.now():
-        raise HTTPException(status_code=400, detail="Auction has ended")
+    # Validate against the in-memory order book of the plate, bids on
+    # other plates go on in parallel
+    async with order_book.lock(bid.plate_id, db=db):
+        book = await order_book.get(db, bid.plate_id)
+        if not book:
+            raise HTTPException(status_code=404, detail="Plate not found")
+        
+        try:
+            placed = await _place_bid(db, book, current_user, bid.amount, datetime.now())
+            await db.commit()
+        except BidRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        except Exception as e:
+            await db.rollback()
+            order_book.discard(bid.plate_id)
+            if isinstance(e, (IntegrityError, StaleBook)):
+                # A concurrent request, possibly in another worker, changed the plate first
+                raise HTTPException(status_code=409, detail="Bid conflicts with a concurrent bid, please retry")
+            raise
+        
+        # Notify all connected WebSocket clients in the order bids were admitted
+        await manager.broadcast(json.dumps(placed["message"]), bid.plate_id)
+        if placed["new_deadline"]:
+            await announce_deadline_extension(book, placed["new_deadline"])
     
-    # Check if user already has a bid for this plate
-    existing_bid = db.query(models.Bid).filter(
-        models.Bid.plate_id == bid.plate_id,
-        models.Bid.user_id == current_user.id
-    ).first()
+    return placed["bid"]
+
+@app.post("/bids/batch", response_model=List[schemas.BidBatchResult])
+async def create_bids_batch(
+    bids: List[schemas.BidCreate],
+    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Place bids on several plates in one transaction
+
+    Each item is validated on its own and gets its own result, rejected
+    items do not stop the others. A database conflict rolls back the whole
+    batch. Watchers of a plate get one message with its final price.
+    """
+    if len(bids) > BID_BATCH_MAX_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {BID_BATCH_MAX_SIZE} bids per batch")
+    
+    # Every plate of the batch is locked for the whole transaction
+    async with order_book.lock(*(item.plate_id for item in bids), db=db):
+        now = datetime.now()
+        results = []
+        books = {}
+        placed_by_plate = {}
+        for item in bids:
+            amount = item.amount.quantize(Decimal("0.01"))
+            book = books.get(item.plate_id) or await order_book.get(db, item.plate_id)
+            if not book:
+                results.append(schemas.BidBatchResult(
+                    plate_id=item.plate_id, status_code=404, detail="Plate not found"
+                ))
+                continue
+            books[item.plate_id] = book
+            
+            # A late plate is extended once per batch, not once per bid on it
+            previous = placed_by_plate.get(item.plate_id)
+            extended = bool(previous and previous["new_deadline"])
+            try:
+                placed = await _place_bid(
+                    db, book, current_user, amount, now, extend_deadline=not extended
+                )
+            except BidRejected as e:
+                results.append(schemas.BidBatchResult(
+                    plate_id=item.plate_id, status_code=e.status_code, detail=e.detail
+                ))
+                continue
+            except Exception as e:
+                await db.rollback()
+                for plate_id in books:
+                    order_book.discard(plate_id)
+                if isinstance(e, (IntegrityError, StaleBook)):
+                    raise HTTPException(status_code=409, detail="Bid conflicts with a concurrent bid, please retry")
+                raise
+            
+            results.append(schemas.BidBatchResult(
+                plate_id=item.plate_id, status_code=201, bid=placed["bid"]
+            ))
+            # Later bids on the same plate supersede the message
+            placed_by_plate[item.plate_id] = {
+                "message": placed["message"],
+                "new_deadline": placed["new_deadline"] or (previous and previous["new_deadline"]),
+            }
+        
+        try:
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            for plate_id in books:
+                order_book.discard(plate_id)
+            if isinstance(e, IntegrityError):
+                raise HTTPException(status_code=409, detail="Bid conflicts with a concurrent bid, please retry")
+            raise
+        
+        for plate_id, placed in placed_by_plate.items():
+            await manager.broadcast(json.dumps(placed["message"]), plate_id)
+            if placed["new_deadline"]:
+                await announce_deadline_extension(books[plate_id], placed["new_deadline"])
     
-    # Find the highest current bid
-    highest_bid = db.query(models.Bid).filter(
-        models.Bid.plate_id == bid.plate_id
-    ).order_by(models.Bid.amount.desc()).first()
+    return results
+
+@app.post("/bids/proxy", response_model=schemas.ProxyBidResponse, status_code=201)
+async def set_proxy_bid(
+    proxy: schemas.ProxyBidCreate,
+    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    proxy.max_amount = proxy.max_amount.quantize(Decimal("0.01"))
     
-    # Check if bid is higher than current highest
-    if highest_bid and bid.amount <= highest_bid.amount:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Bid must be higher than the current highest bid of {highest_bid.amount}"
+    async with order_book.lock(proxy.plate_id, db=db):
+        book = await order_book.get(db, proxy.plate_id)
+        if not book:
+            raise HTTPException(status_code=404, detail="Plate not found")
+        
+        now = datetime.now()
+        try:
+            book.check_bid(current_user.id, proxy.max_amount, now)
+        except BidRejected as e:
+            raise HTTPException(status_code=e.status_code, detail=e.detail)
+        
+        db_proxy = await db.scalar(
+            select(models.ProxyBid).where(
+                models.ProxyBid.plate_id == proxy.plate_id,
+                models.ProxyBid.user_id == current_user.id
+            )
         )
-    
-    if existing_bid:
-        # Update existing bid if user already bid
-        existing_bid.amount = bid.amount
-        existing_bid.created_at = datetime.now()
-        db.commit()
-        db.refresh(existing_bid)
-        new_bid = existing_bid
-    else:
-        # Create new bid
-        new_bid = models.Bid(
-            amount=bid.amount,
+        if db_proxy:
+            db_proxy.max_amount = proxy.max_amount
+            db_proxy.created_at = now
+        else:
+            db_proxy = models.ProxyBid(
+                max_amount=proxy.max_amount,
+                user_id=current_user.id,
+                plate_id=proxy.plate_id,
+                created_at=now
+            )
+            db.add(db_proxy)
+        
+        # Settle all proxies of the plate against the current top bid
+        book.proxies[current_user.id] = (proxy.max_amount, now)
+        resolved = book.resolve_proxies(book.top_user_id, book.top_amount, BID_INCREMENT)
+        new_deadline = None
+        try:
+            await db.flush()
+            if resolved:
+                new_bids = 0
+                for user_id, amount in resolved:
+                    bid_id, is_new = await save_bid(db, book, user_id, amount, now)
+                    book.apply_bid(bid_id, user_id, amount)
+                    new_bids += int(is_new)
+                await write_plate_bid_stats(
+                    db, book,
+                    highest_bid_amount=book.top_amount,
+                    bid_count=models.AutoPlate.bid_count + new_bids
+                )
+                new_deadline = await extend_deadline_for_late_bid(db, book, now)
+            else:
+                # Proxies are part of the book, other workers must reload it
+                await write_plate_bid_stats(db, book)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            order_book.discard(proxy.plate_id)
+            if isinstance(e, (IntegrityError, StaleBook)):
+                raise HTTPException(status_code=409, detail="Bid conflicts with a concurrent bid, please retry")
+            raise
+        
+        if resolved:
+            await broadcast_proxy_bid(db, proxy.plate_id, book.top_user_id, book.top_amount, now)
+            if new_deadline:
+                await announce_deadline_extension(book, new_deadline)
+        
+        current_bid = book.user_bids.get(current_user.id)
+        return schemas.ProxyBidResponse(
+            id=db_proxy.id,
+            plate_id=proxy.plate_id,
+            max_amount=proxy.max_amount,
             user_id=current_user.id,
-            plate_id=bid.plate_id,
-            created_at=datetime.now()
+            created_at=now,
+            current_bid=current_bid[1] if current_bid else None
         )
-        db.add(new_bid)
-        db.commit()
-        db.refresh(new_bid)
-    
-    # Notify all connected WebSocket clients about the new bid
-    bid_update = {
-        "action": "new_bid",
-        "plate_id": new_bid.plate_id,
-        "bid_amount": float(new_bid.amount),
-        "bidder_id": new_bid.user_id,
-        "bidder_username": current_user.username,
-        "timestamp": new_bid.created_at.isoformat()
-    }
-    
-    await manager.broadcast(json.dumps(bid_update), new_bid.plate_id)
+
+@app.delete("/bids/proxy/{plate_id}", status_code=204)
+async def cancel_proxy_bid(
+    plate_id: int,
+    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    db_proxy = await db.scalar(
+        select(models.ProxyBid).where(
+            models.ProxyBid.plate_id == plate_id,
+            models.ProxyBid.user_id == current_user.id
+        )
+    )
+    if not db_proxy:
+        raise HTTPException(status_code=404, detail="Proxy bid not found")
+    
+    # Bids already placed by the proxy stay
+    async with order_book.lock(plate_id, db=db):
+        book = await order_book.get(db, plate_id)
+        try:
+            await db.delete(db_proxy)
+            await write_plate_bid_stats(db, book)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            order_book.discard(plate_id)
+            if isinstance(e, StaleBook):
+                raise HTTPException(status_code=409, detail="Plate changed concurrently, please retry")
+            raise
+        
+        book.proxies.pop(current_user.id, None)
     
-    return new_bid
+    return None
 
 @app.get("/bids/{bid_id}", response_model=schemas.BidResponse)
-def get_bid(
+async def get_bid(
     bid_id: int,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    bid = db.query(models.Bid).filter(models.Bid.id == bid_id).first()
+    bid = await db.get(models.Bid, bid_id)
     if not bid:
         raise HTTPException(status_code=404, detail="Bid not found")
     
@@ -421,16 +1049,16 @@ async def update_bid(
     bid_id: int,
     bid_update: schemas.BidUpdate,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    bid = db.query(models.Bid).filter(models.Bid.id == bid_id).first()
+    bid = await db.get(models.Bid, bid_id)
     if not bid:
         raise HTTPException(status_code=404, detail="Bid not found")
     
     if bid.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to update this bid")
     
-    plate = db.query(models.AutoPlate).filter(models.AutoPlate.id == bid.plate_id).first()
+    plate = await db.get(models.AutoPlate, bid.plate_id)
     if plate.deadline <= datetime.now():
         raise HTTPException(status_code=403, detail="Auction period has ended")
     
@@ -438,87 +1066,315 @@ async def update_bid(
     if bid_update.amount <= 0:
         raise HTTPException(status_code=400, detail="Bid amount must be positive")
     
-    # Find the highest current bid
-    highest_bid = db.query(models.Bid).filter(
-        models.Bid.plate_id == bid.plate_id
-    ).order_by(models.Bid.amount.desc()).first()
-    
-    # Check if bid is higher than current highest (if not the user's own bid)
-    if highest_bid and highest_bid.id != bid.id and bid_update.amount <= highest_bid.amount:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Bid must be higher than the current highest bid of {highest_bid.amount}"
-        )
-    
-    bid.amount = bid_update.amount
-    db.commit()
-    db.refresh(bid)
-    
-    # Notify all connected WebSocket clients about the updated bid
-    bid_update_message = {
-        "action": "bid_updated",
-        "plate_id": bid.plate_id,
-        "bid_id": bid.id,
-        "bid_amount": float(bid.amount),
-        "bidder_id": bid.user_id,
-        "bidder_username": current_user.username,
-        "timestamp": datetime.now().isoformat()
-    }
-    
-    await manager.broadcast(json.dumps(bid_update_message), bid.plate_id)
-    
-    return bid
+    async with order_book.lock(bid.plate_id, db=db):
+        # Check if bid is higher than current highest (if not the user's own bid)
+        book = await order_book.get(db, bid.plate_id)
+        if book.top_bid_id is not None and book.top_bid_id != bid.id and bid_update.amount <= book.top_amount:
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Bid must be higher than the current highest bid of {book.top_amount}"
+            )
+        
+        now = datetime.now()
+        proxy_bids = []
+        if book.top_amount is None or bid_update.amount > book.top_amount:
+            proxy_bids = book.resolve_proxies(bid.user_id, bid_update.amount, BID_INCREMENT)
+            if proxy_bids and proxy_bids[-1][0] == bid.user_id:
+                # The bidder's own proxy competes with other ones, bid at its price
+                bid_update.amount = proxy_bids.pop()[1]
+        
+        try:
+            bid.amount = bid_update.amount
+            await db.flush()
+            book.apply_bid(bid.id, bid.user_id, bid.amount)
+            for proxy_user_id, proxy_amount in proxy_bids:
+                proxy_bid_id, _ = await save_bid(db, book, proxy_user_id, proxy_amount, now)
+                book.apply_bid(proxy_bid_id, proxy_user_id, proxy_amount)
+            await refresh_plate_bid_stats(db, book)
+            new_deadline = await extend_deadline_for_late_bid(db, book, now)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            order_book.discard(book.plate_id)
+            if isinstance(e, (IntegrityError, StaleBook)):
+                raise HTTPException(status_code=409, detail="Bid conflicts with a concurrent bid, please retry")
+            raise
+        await db.refresh(bid)
+        if proxy_bids:
+            # A proxy answered, only the resulting price is announced
+            await broadcast_proxy_bid(db, book.plate_id, book.top_user_id, book.top_amount, now)
+            if new_deadline:
+                await announce_deadline_extension(book, new_deadline)
+            return bid
+        
+        # Notify all connected WebSocket clients about the updated bid
+        bid_update_message = {
+            "action": "bid_updated",
+            "plate_id": bid.plate_id,
+            "bid_id": bid.id,
+            "bid_amount": float(bid.amount),
+            "bidder_id": bid.user_id,
+            "bidder_username": current_user.username,
+            "timestamp": datetime.now().isoformat()
+        }
+        
+        await manager.broadcast(json.dumps(bid_update_message), bid.plate_id)
+        if new_deadline:
+            await announce_deadline_extension(book, new_deadline)
+        
+        return bid
 
 @app.delete("/bids/{bid_id}", status_code=204)
 async def delete_bid(
     bid_id: int,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    bid = db.query(models.Bid).filter(models.Bid.id == bid_id).first()
+    bid = await db.get(models.Bid, bid_id)
     if not bid:
         raise HTTPException(status_code=404, detail="Bid not found")
     
     if bid.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized to delete this bid")
     
-    plate = db.query(models.AutoPlate).filter(models.AutoPlate.id == bid.plate_id).first()
+    plate = await db.get(models.AutoPlate, bid.plate_id)
     if plate.deadline <= datetime.now():
         raise HTTPException(status_code=403, detail="Auction period has ended")
     
     plate_id = bid.plate_id
-    db.delete(bid)
-    db.commit()
+    async with order_book.lock(plate_id, db=db):
+        book = await order_book.get(db, plate_id)
+        try:
+            await db.delete(bid)
+            await db.flush()
+            await refresh_plate_bid_stats(db, book)
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            order_book.discard(plate_id)
+            if isinstance(e, StaleBook):
+                raise HTTPException(status_code=409, detail="Plate changed concurrently, please retry")
+            raise
+        
+        book.remove_bid(current_user.id)
+        
+        # Notify all connected WebSocket clients about the deleted bid
+        bid_delete_message = {
+            "action": "bid_deleted",
+            "plate_id": plate_id,
+            "bid_id": bid_id,
+            "bidder_id": current_user.id,
+            "bidder_username": current_user.username,
+            "timestamp": datetime.now().isoformat()
+        }
+        
+        await manager.broadcast(json.dumps(bid_delete_message), plate_id)
     
-    # Notify all connected WebSocket clients about the deleted bid
-    bid_delete_message = {
-        "action": "bid_deleted",
+    return None
+
+def plate_snapshot(
+    plate_id: int, highest_bid: Optional[Decimal], bid_count: int, deadline: datetime, is_active: bool
+) -> dict:
+    return {
+        "action": "snapshot",
         "plate_id": plate_id,
-        "bid_id": bid_id,
-        "bidder_id": current_user.id,
-        "bidder_username": current_user.username,
+        "highest_bid": float(highest_bid) if highest_bid is not None else None,
+        "bid_count": bid_count or 0,
+        "deadline": deadline.isoformat(),
+        "is_active": is_active,
         "timestamp": datetime.now().isoformat()
     }
-    
-    await manager.broadcast(json.dumps(bid_delete_message), plate_id)
-    
-    return None
+
+async def watch_plates(websocket: WebSocket, db: AsyncSession, plate_ids: List[int]) -> List[int]:
+    """Subscribe the socket to the plates that exist, returns their ids
+
+    Each subscription is followed by a snapshot of the plate. Both are done
+    under the plate's admission lock, so every bid is either in the
+    snapshot or broadcast after it. Plates without an order book are read
+    with one query from their stored stats, watching builds no book.
+    """
+    found = set()
+    unloaded = []
+    for plate_id in plate_ids:
+        async with order_book.lock(plate_id):
+            book = order_book.plates.get(plate_id)
+            if book is not None:
+                manager.subscribe(websocket, [plate_id])
+                manager.send(websocket, json.dumps(plate_snapshot(
+                    plate_id, book.top_amount, book.bid_count, book.deadline, book.is_active
+                )))
+                found.add(plate_id)
+                continue
+        unloaded.append(plate_id)
+    
+    if unloaded:
+        async with order_book.lock(*unloaded, db=db):
+            plates = await db.execute(
+                select(
+                    models.AutoPlate.id, models.AutoPlate.highest_bid_amount, models.AutoPlate.bid_count,
+                    models.AutoPlate.deadline, models.AutoPlate.is_active
+                ).where(models.AutoPlate.id.in_(unloaded))
+            )
+            for plate_id, highest_bid, bid_count, deadline, is_active in plates:
+                manager.subscribe(websocket, [plate_id])
+                manager.send(websocket, json.dumps(
+                    plate_snapshot(plate_id, highest_bid, bid_count, deadline, is_active)
+                ))
+                found.add(plate_id)
+    return [plate_id for plate_id in plate_ids if plate_id in found]
 
 # WebSocket endpoint for real-time updates
 @app.websocket("/ws/{plate_id}")
-async def websocket_endpoint(websocket: WebSocket, plate_id: int, db: Session = Depends(get_db)):
-    plate = db.query(models.AutoPlate).filter(models.AutoPlate.id == plate_id).first()
-    if not plate:
+async def websocket_endpoint(websocket: WebSocket, plate_id: int):
+    await manager.connect(websocket)
+    # A short session, an open socket must not hold a pooled connection
+    async with AsyncSessionLocal() as db:
+        found = await watch_plates(websocket, db, [plate_id])
+    if not found:
+        manager.disconnect(websocket)
         await websocket.close(code=1008, reason="Plate not found")
         return
     
-    await manager.connect(websocket, plate_id)
     try:
         while True:
-            # Just keep the connection alive, we'll broadcast from the bid endpoints
+            # Clients only answer pings, we'll broadcast from the bid endpoints
             await websocket.receive_text()
+            manager.touch(websocket)
     except WebSocketDisconnect:
-        manager.disconnect(websocket, plate_id)
+        manager.disconnect(websocket)
+
+async def handle_subscription(websocket: WebSocket, text: str) -> Optional[dict]:
+    try:
+        request = schemas.SubscriptionRequest.model_validate_json(text)
+    except ValidationError:
+        request = None
+    if request is not None and request.action == "pong":
+        return None
+    if request is None or request.plate_ids is None:
+        return {"action": "error", "detail": 'Expected {"action": ..., "plate_ids": [<int>, ...]}'}
+    action = request.action
+    plate_ids = list(dict.fromkeys(request.plate_ids))
+    
+    if action == "unsubscribe":
+        manager.unsubscribe(websocket, plate_ids)
+        return {"action": "unsubscribed", "plate_ids": plate_ids}
+    if action != "subscribe":
+        return {"action": "error", "detail": f"Unknown action: {action}"}
+    
+    subscribed = manager.subscriptions(websocket)
+    if len(subscribed | set(plate_ids)) > WS_MAX_SUBSCRIPTIONS:
+        return {"action": "error", "detail": f"At most {WS_MAX_SUBSCRIPTIONS} plates per socket"}
+    
+    # Plates with an order book need no query, the session is only used for the others
+    async with AsyncSessionLocal() as db:
+        found = await watch_plates(websocket, db, plate_ids)
+    return {
+        "action": "subscribed",
+        "plate_ids": found,
+        "unknown": [plate_id for plate_id in plate_ids if plate_id not in found]
+    }
+
+@app.websocket("/ws")
+async def multiplexed_websocket(websocket: WebSocket):
+    """One socket for any number of plates
+
+    Clients send {"action": "subscribe" | "unsubscribe", "plate_ids": [...]}
+    and get {"action": "subscribed" | "unsubscribed", "plate_ids": [...]}
+    back, plates that do not exist are listed under "unknown". Plate
+    messages are the same as on /ws/{plate_id} and carry their plate_id;
+    each subscription starts with a "snapshot" message of the plate.
+    Pings are answered with {"action": "pong"}.
+    """
+    await manager.connect(websocket)
+    try:
+        while True:
+            text = await websocket.receive_text()
+            manager.touch(websocket)
+            reply = await handle_subscription(websocket, text)
+            if reply:
+                # Queued like broadcasts, so the socket keeps a single writer
+                manager.send(websocket, json.dumps(reply))
+    except WebSocketDisconnect:
+        manager.disconnect(websocket)
+
+def sse_event(event_id: str, event: str, data: str) -> str:
+    return f"id: {event_id}\nevent: {event}\ndata: {data}\n\n"
+
+@app.get("/plates/{plate_id}/events")
+async def plate_events(plate_id: int, request: Request, last_event_id: Optional[str] = None):
+    """Server-Sent Events of a plate: the same messages as /ws/{plate_id}
+
+    A client reconnecting with Last-Event-ID (header, or query parameter for
+    a first connect) is sent only the events it missed. Without one, or when
+    they are no longer in memory, the stream opens with a ``snapshot`` event
+    holding the plate with its highest bid.
+    """
+    last_event_id = request.headers.get("last-event-id") or last_event_id
+    seq = event_log.parse_event_id(last_event_id) if last_event_id else None
+    missed = event_log.since(plate_id, seq) if seq is not None else None
+    
+    snapshot = None
+    if missed is None:
+        # Events up to seq are committed, so the snapshot includes them
+        seq = event_log.seq
+        missed = []
+        # A short session, the stream itself must not hold a pooled connection
+        async with AsyncSessionLocal() as db:
+            plate = await db.get(models.AutoPlate, plate_id)
+        if not plate:
+            raise HTTPException(status_code=404, detail="Plate not found")
+        snapshot = plate_with_highest_bid(plate).model_dump_json()
+        event_log.snapshots += 1
+    else:
+        # Resuming needs no snapshot, but the plate still has to exist
+        if plate_id not in order_book.plates:
+            async with AsyncSessionLocal() as db:
+                exists = await db.scalar(
+                    select(models.AutoPlate.id).where(models.AutoPlate.id == plate_id)
+                )
+            if not exists:
+                raise HTTPException(status_code=404, detail="Plate not found")
+        event_log.resumed += 1
+    
+    async def stream():
+        position = seq
+        event_log.streams += 1
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+            if snapshot:
+                yield sse_event(event_log.event_id(position), "snapshot", snapshot)
+            events = missed
+            while True:
+                if events is None:
+                    # Fell behind the ring buffer, the client resumes from a snapshot
+                    return
+                for position, name, data in events:
+                    yield sse_event(event_log.event_id(position), name, data)
+                if not await event_log.wait(plate_id, position, SSE_KEEPALIVE_SECONDS):
+                    yield ": keep-alive\n\n"
+                events = event_log.since(plate_id, position)
+        finally:
+            event_log.streams -= 1
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        # Proxies must pass events through as they come
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/metrics")
+def metrics():
+    return {
+        "websocket": manager.stats(),
+        "password_hasher": password_hasher.stats(),
+        "auth_cache": auth_cache.stats(),
+        "auction_scheduler": auction_scheduler.stats(),
+        "page_cache": page_cache.stats(),
+        "order_book": order_book.stats(),
+        "event_log": event_log.stats(),
+        "database_pool": pool_stats()
+    }
 
 # Web UI Routes
 @app.get("/", response_class=HTMLResponse)
@@ -526,51 +1382,47 @@ async def home(
     request: Request,
     ordering: Optional[str] = None,
     plate_number__contains: Optional[str] = None,
+    plate_number__pattern: Optional[str] = None,
+    cursor: Optional[str] = None,
     current_user: Optional[models.User] = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
-    # Base query
-    query = db.query(models.AutoPlate).filter(models.AutoPlate.is_active == True)
-    
-    # Filter by plate number if provided
-    if plate_number__contains:
-        query = query.filter(models.AutoPlate.plate_number.ilike(f"%{plate_number__contains}%"))
-    
-    # Apply ordering
-    if ordering:
-        if ordering == "deadline":
-            query = query.order_by(models.AutoPlate.deadline.asc())
-        elif ordering == "-deadline":
-            query = query.order_by(models.AutoPlate.deadline.desc())
-    else:
-        query = query.order_by(models.AutoPlate.deadline.asc())
-    
-    plates = query.all()
+    # Only anonymous visitors share a page, signed-in users see their own menu
+    cache_key = page_cache_key(request) if current_user is None else None
+    if cache_key:
+        cached = cached_page(cache_key)
+        if cached:
+            return cached
+    generation = page_cache.generation
+    
+    plates, next_cursor = await get_active_plates(
+        db, ordering, plate_number__contains, cursor, plate_number__pattern=plate_number__pattern
+    )
     
-    # Add highest bids
     result = []
     for plate in plates:
-        highest_bid = db.query(models.Bid).filter(
-            models.Bid.plate_id == plate.id
-        ).order_by(models.Bid.amount.desc()).first()
-        
         result.append({
             "id": plate.id,
             "plate_number": plate.plate_number,
             "description": plate.description,
             "deadline": plate.deadline,
             "is_active": plate.is_active,
-            "highest_bid": highest_bid.amount if highest_bid else None
+            "highest_bid": plate.highest_bid_amount,
+            "bid_count": plate.bid_count
         })
     
-    return templates.TemplateResponse(
+    response = templates.TemplateResponse(
         "index.html",
         {
             "request": request,
             "user": current_user,
             "plates": result,
+            "next_url": next_page_url(request, next_cursor),
         }
     )
+    if cache_key:
+        page_cache.put(cache_key, response.body, ["listing"], generation)
+    return response
 
 @app.get("/login-page", response_class=HTMLResponse)
 async def login_page(request: Request):
@@ -581,16 +1433,25 @@ async def register_page(request: Request):
     return templates.TemplateResponse("register.html", {"request": request})
 
 @app.get("/plate/{plate_id}", response_class=HTMLResponse)
-async def plate_detail(request: Request, plate_id: int, db: Session = Depends(get_db)):
-    plate = db.query(models.AutoPlate).filter(models.AutoPlate.id == plate_id).first()
+async def plate_detail(request: Request, plate_id: int, db: AsyncSession = Depends(get_db)):
+    # The page only differs by whether the visitor is signed in
+    cache_key = page_cache_key(request, bool(request.cookies.get("token")))
+    cached = cached_page(cache_key)
+    if cached:
+        return cached
+    generation = page_cache.generation
+    
+    plate = await db.get(models.AutoPlate, plate_id)
     if not plate:
         raise HTTPException(status_code=404, detail="Plate not found")
     
-    bids = db.query(models.Bid).filter(models.Bid.plate_id == plate_id).order_by(models.Bid.amount.desc()).all()
+    bids = (await db.scalars(
+        select(models.Bid).where(models.Bid.plate_id == plate_id).order_by(models.Bid.amount.desc())
+    )).all()
     
     highest_bid = bids[0].amount if bids else 0
     
-    return templates.TemplateResponse(
+    response = templates.TemplateResponse(
         "plate_detail.html", 
         {
             "request": request, 
@@ -599,21 +1460,47 @@ async def plate_detail(request: Request, plate_id: int, db: Session = Depends(ge
             "highest_bid": highest_bid
         }
     )
+    page_cache.put(cache_key, response.body, [f"plate:{plate_id}"], generation)
+    return response
 
 @app.get("/admin/plates", response_class=HTMLResponse)
 async def admin_plates(
     request: Request, 
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if not current_user.is_staff:
         raise HTTPException(status_code=403, detail="Not authorized to access admin area")
     
-    plates = db.query(models.AutoPlate).all()
-    return templates.TemplateResponse(
+    cache_key = page_cache_key(request, current_user.id)
+    cached = cached_page(cache_key)
+    if cached:
+        return cached
+    generation = page_cache.generation
+    
+    # Newest plates first
+    query = keyset(
+        select(models.AutoPlate),
+        [models.AutoPlate.id],
+        decode_cursor(cursor, int) if cursor else None,
+        DEFAULT_PAGE_SIZE,
+        descending=True
+    )
+    plates, next_cursor = split_page(
+        (await db.scalars(query)).all(), DEFAULT_PAGE_SIZE, lambda plate: (plate.id,)
+    )
+    response = templates.TemplateResponse(
         "admin_plates.html", 
-        {"request": request, "plates": plates, "user": current_user}
+        {
+            "request": request,
+            "plates": plates,
+            "user": current_user,
+            "next_url": next_page_url(request, next_cursor)
+        }
     )
+    page_cache.put(cache_key, response.body, ["listing"], generation)
+    return response
 
 @app.get("/admin/plate/new", response_class=HTMLResponse)
 async def admin_new_plate(
@@ -646,12 +1533,12 @@ async def admin_edit_plate(
     request: Request, 
     plate_id: int,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if not current_user.is_staff:
         raise HTTPException(status_code=403, detail="Not authorized to access admin area")
     
-    plate = db.query(models.AutoPlate).filter(models.AutoPlate.id == plate_id).first()
+    plate = await db.get(models.AutoPlate, plate_id)
     if not plate:
         raise HTTPException(status_code=404, detail="Plate not found")
     
@@ -668,54 +1555,96 @@ async def admin_edit_plate(
 @app.get("/admin/users", response_class=HTMLResponse)
 async def admin_users(
     request: Request, 
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if not current_user.is_staff:
         raise HTTPException(status_code=403, detail="Adminlik huquqi yo'q")
     
-    users = db.query(models.User).all()
+    query = keyset(
+        select(models.User),
+        [models.User.id],
+        decode_cursor(cursor, int) if cursor else None,
+        DEFAULT_PAGE_SIZE
+    )
+    users, next_cursor = split_page(
+        (await db.scalars(query)).all(), DEFAULT_PAGE_SIZE, lambda user: (user.id,)
+    )
     return templates.TemplateResponse(
         "admin_users.html", 
-        {"request": request, "users": users, "user": current_user}
+        {
+            "request": request,
+            "users": users,
+            "user": current_user,
+            "next_url": next_page_url(request, next_cursor)
+        }
     )
 
 @app.get("/admin/bids", response_class=HTMLResponse)
 async def admin_bids(
     request: Request, 
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if not current_user.is_staff:
         raise HTTPException(status_code=403, detail="Adminlik huquqi yo'q")
     
-    bids = db.query(models.Bid).order_by(models.Bid.created_at.desc()).all()
+    query = keyset(
+        select(models.Bid),
+        [models.Bid.created_at, models.Bid.id],
+        decode_cursor(cursor, datetime, int) if cursor else None,
+        DEFAULT_PAGE_SIZE,
+        descending=True
+    )
+    bids, next_cursor = split_page(
+        (await db.scalars(query)).all(), DEFAULT_PAGE_SIZE, lambda bid: (bid.created_at, bid.id)
+    )
     return templates.TemplateResponse(
         "admin_bids.html", 
-        {"request": request, "bids": bids, "user": current_user}
+        {
+            "request": request,
+            "bids": bids,
+            "user": current_user,
+            "next_url": next_page_url(request, next_cursor)
+        }
     )
 
 @app.post("/admin/plate/{plate_id}/toggle")
 async def toggle_plate_status(
     plate_id: int,
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if not current_user.is_staff:
         raise HTTPException(status_code=403, detail="Adminlik huquqi yo'q")
     
-    plate = db.query(models.AutoPlate).filter(models.AutoPlate.id == plate_id).first()
-    if not plate:
-        raise HTTPException(status_code=404, detail="Raqam topilmadi")
-    
-    plate.is_active = not plate.is_active
-    db.commit()
+    async with order_book.lock(plate_id, db=db):
+        plate = await db.get(models.AutoPlate, plate_id)
+        if not plate:
+            raise HTTPException(status_code=404, detail="Raqam topilmadi")
+        
+        plate.is_active = not plate.is_active
+        await db.commit()
+        order_book.update_plate(plate)
+        schedule_plate(plate)
+        plate_changed(plate.id)
     
     return RedirectResponse(
         url="/admin/plates",
         status_code=status.HTTP_302_FOUND
     )
 
+def optional_seconds(value: Optional[str]) -> Optional[int]:
+    # Blank form fields turn the setting off
+    if not value:
+        return None
+    seconds = int(value)
+    if seconds < 0:
+        raise ValueError("Soniyalar manfiy bo'lmasligi kerak")
+    return seconds
+
 @app.post("/admin/plate/new")
 async def admin_create_plate(
     request: Request,
@@ -723,17 +1652,19 @@ async def admin_create_plate(
     description: str = Form(...),
     starting_price: float = Form(...),
     deadline: str = Form(...),
+    snipe_window_seconds: Optional[str] = Form(None),
+    snipe_extension_seconds: Optional[str] = Form(None),
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     if not current_user.is_staff:
         raise HTTPException(status_code=403, detail="Not authorized")
     
     try:
         # Check if plate number already exists
-        existing_plate = db.query(models.AutoPlate).filter(
-            models.AutoPlate.plate_number == plate_number
-        ).first()
+        existing_plate = await db.scalar(
+            select(models.AutoPlate).where(models.AutoPlate.plate_number == plate_number)
+        )
         
         if existing_plate:
             return templates.TemplateResponse(
@@ -762,12 +1693,16 @@ async def admin_create_plate(
             description=description,
             starting_price=Decimal(str(starting_price)),
             deadline=deadline_dt,
+            snipe_window_seconds=optional_seconds(snipe_window_seconds),
+            snipe_extension_seconds=optional_seconds(snipe_extension_seconds),
             created_by_id=current_user.id,
             is_active=True
         )
         
         db.add(plate)
-        db.commit()
+        await db.commit()
+        schedule_plate(plate)
+        plate_changed(plate.id)
         
         return RedirectResponse(
             url="/admin/plates",
@@ -816,9 +1751,11 @@ async def admin_update_plate(
     description: str = Form(...),
     starting_price: float = Form(...),
     deadline: str = Form(...),
+    snipe_window_seconds: Optional[str] = Form(None),
+    snipe_extension_seconds: Optional[str] = Form(None),
     is_active: bool = Form(False),
     current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     try:
         deadline_dt = datetime.fromisoformat(deadline)
@@ -828,10 +1765,12 @@ async def admin_update_plate(
             description=description,
             starting_price=Decimal(str(starting_price)),
             deadline=deadline_dt,
+            snipe_window_seconds=optional_seconds(snipe_window_seconds),
+            snipe_extension_seconds=optional_seconds(snipe_extension_seconds),
             is_active=is_active
         )
         
-        update_plate(plate_id, plate_update, current_user, db)
+        await update_plate(plate_id, plate_update, current_user, db)
         return RedirectResponse(
             url="/admin/plates",
             status_code=status.HTTP_302_FOUND
@@ -843,7 +1782,7 @@ async def admin_update_plate(
                 "request": request,
                 "error": str(e),
                 "user": current_user,
-                "plate": db.query(models.AutoPlate).filter(models.AutoPlate.id == plate_id).first(),
+                "plate": await db.get(models.AutoPlate, plate_id),
                 "now": datetime.now()
             },
             status_code=400
@@ -855,11 +1794,11 @@ async def web_register(
     username: str = Form(...),
     email: str = Form(...),
     password: str = Form(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     try:
         # Check if username already exists
-        existing_user = get_user_by_username(db, username)
+        existing_user = await get_user_by_username(db, username)
         if existing_user:
             return templates.TemplateResponse(
                 "register.html",
@@ -870,7 +1809,7 @@ async def web_register(
             )
         
         # Create new user
-        hashed_password = get_password_hash(password)
+        hashed_password = await get_password_hash(password)
         user = models.User(
             username=username,
             email=email,
@@ -878,7 +1817,7 @@ async def web_register(
             is_staff=False
         )
         db.add(user)
-        db.commit()
+        await db.commit()
         
         # Create access token
         access_token = create_access_token(
@@ -913,7 +1852,7 @@ async def web_place_bid(
     request: Request,
     plate_id: int,
     amount: float = Form(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     # Get token from cookie
     token = request.cookies.get("token")
@@ -927,12 +1866,7 @@ async def web_place_bid(
         # Extract actual token
         token = token.split("Bearer ")[1]
         # Verify token and get user
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username = payload.get("sub")
-        if not username:
-            raise HTTPException(status_code=401)
-        
-        user = get_user_by_username(db, username)
+        user = await get_user_from_token(db, token)
         if not user:
             raise HTTPException(status_code=401)
             
@@ -947,17 +1881,17 @@ async def web_place_bid(
             status_code=status.HTTP_302_FOUND
         )
         
-    except jwt.JWTError:
+    except jwt.PyJWTError:
         return RedirectResponse(
             url="/login-page",
             status_code=status.HTTP_302_FOUND
         )
     except HTTPException as e:
         # Return to plate page with error
-        plate = db.query(models.AutoPlate).filter(models.AutoPlate.id == plate_id).first()
-        bids = db.query(models.Bid).filter(
-            models.Bid.plate_id == plate_id
-        ).order_by(models.Bid.amount.desc()).all()
+        plate = await db.get(models.AutoPlate, plate_id)
+        bids = (await db.scalars(
+            select(models.Bid).where(models.Bid.plate_id == plate_id).order_by(models.Bid.amount.desc())
+        )).all()
         
         highest_bid = bids[0].amount if bids else 0
         
@@ -978,10 +1912,10 @@ async def web_login(
     username: str = Form(...),
     password: str = Form(...),
     next: str = Form("/"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     try:
-        user = authenticate_user(db, username, password)
+        user = await authenticate_user(db, username, password)
         if not user:
             return templates.TemplateResponse(
                 "login.html",
@@ -1030,9 +1964,9 @@ async def logout():
 def create_admin_user():
     db = SessionLocal()
     try:
-        admin = get_user_by_username(db, "admin")
+        admin = db.query(models.User).filter(models.User.username == "admin").first()
         if not admin:
-            hashed_password = get_password_hash("admin")
+            hashed_password = pwd_context.hash("admin")
             admin_user = models.User(
                 username="admin",
                 email="admin@example.com",
@@ -1054,4 +1988,12 @@ if __name__ == "__main__":
     create_admin_user()
     
     # Run the app
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=True,
+        ws="websockets",
+        ws_ping_interval=UVICORN_WS_PING_INTERVAL,
+        ws_ping_timeout=UVICORN_WS_PING_TIMEOUT
+    )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Boolean, Text, Numeric
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Boolean, Text, Numeric, Index
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
@@ -25,9 +25,26 @@ class AutoPlate(Base):
     starting_price = Column(Numeric(10, 2), nullable=False, default=1000)
     created_by_id = Column(Integer, ForeignKey("users.id"))
     is_active = Column(Boolean, default=True)
+    # Denormalized bid stats, kept in sync by the bid endpoints
+    highest_bid_amount = Column(Numeric(10, 2), nullable=True)
+    bid_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Anti-sniping: a bid in the last window seconds extends the deadline
+    snipe_window_seconds = Column(Integer, nullable=True)
+    snipe_extension_seconds = Column(Integer, nullable=True)
+    # Bumped by every change to the plate or its bids: through version_id_col
+    # for ORM updates, by write_plate_bid_stats() for bids. An order book
+    # or ETag with an older version is stale.
+    version = Column(Integer, nullable=False, default=0, server_default="0")
     
     created_by = relationship("User", back_populates="plates")
     bids = relationship("Bid", back_populates="plate", cascade="all, delete-orphan")
+    proxy_bids = relationship("ProxyBid", back_populates="plate", cascade="all, delete-orphan")
+
+    __table_args__ = (
+        # Serves the active plate listing ordered by deadline
+        Index("ix_auto_plates_active_deadline", "is_active", "deadline"),
+    )
+    __mapper_args__ = {"version_id_col": version}
 
 class Bid(Base):
     __tablename__ = "bids"
@@ -42,6 +59,29 @@ class Bid(Base):
     plate = relationship("AutoPlate", back_populates="bids")
     
     __table_args__ = (
+        # Highest bid per plate: plate_id = ? ORDER BY amount DESC
+        Index("ix_bids_plate_id_amount", "plate_id", "amount"),
+        # Bids of a user, newest first
+        Index("ix_bids_user_id_created_at", "user_id", "created_at"),
+        # All bids, newest first
+        Index("ix_bids_created_at", "created_at"),
         # Each user can have only one bid per plate
-        # (Replaced later with logic in bid creation/update)
-    )
\ No newline at end of file
+        Index("uq_bids_plate_id_user_id", "plate_id", "user_id", unique=True),
+    )
+
+class ProxyBid(Base):
+    """Hidden maximum up to which the server bids on the user's behalf"""
+    __tablename__ = "proxy_bids"
+
+    id = Column(Integer, primary_key=True, index=True)
+    max_amount = Column(Numeric(10, 2), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    plate_id = Column(Integer, ForeignKey("auto_plates.id"), nullable=False)
+    created_at = Column(DateTime, default=datetime.now)
+
+    plate = relationship("AutoPlate", back_populates="proxy_bids")
+
+    __table_args__ = (
+        # One proxy per user and plate, also serves loading a plate's proxies
+        Index("uq_proxy_bids_plate_id_user_id", "plate_id", "user_id", unique=True),
+    )
@@ -0,0 +1,279 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import models
+
+
+class BidRejected(Exception):
+    """Raised when a bid fails validation against the order book"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class StaleBook(Exception):
+    """Raised when a plate changed in the database behind its order book"""
+
+
+class PlateBook:
+    """In-memory auction state of a single plate"""
+
+    def __init__(self, plate: models.AutoPlate):
+        self.plate_id = plate.id
+        self.deadline = plate.deadline
+        self.is_active = plate.is_active
+        self.starting_price = plate.starting_price
+        self.snipe_window_seconds = plate.snipe_window_seconds
+        self.snipe_extension_seconds = plate.snipe_extension_seconds
+        self.bid_count = plate.bid_count or 0
+        self.version = plate.version or 0
+        self.top_bid_id: Optional[int] = None
+        self.top_user_id: Optional[int] = None
+        self.top_amount: Optional[Decimal] = None
+        # user_id -> (bid_id, amount)
+        self.user_bids: Dict[int, Tuple[int, Decimal]] = {}
+        # user_id -> (max_amount, created_at) of proxy bids
+        self.proxies: Dict[int, Tuple[Decimal, datetime]] = {}
+
+    def update_plate(self, plate: models.AutoPlate):
+        self.deadline = plate.deadline
+        self.is_active = plate.is_active
+        self.starting_price = plate.starting_price
+        self.snipe_window_seconds = plate.snipe_window_seconds
+        self.snipe_extension_seconds = plate.snipe_extension_seconds
+        self.version = plate.version
+
+    def extended_deadline(self, now: datetime) -> Optional[datetime]:
+        """New deadline for a bid placed at ``now``, None if the bid is not late"""
+        if not self.snipe_window_seconds or not self.snipe_extension_seconds:
+            return None
+        if self.deadline - now > timedelta(seconds=self.snipe_window_seconds):
+            return None
+        return self.deadline + timedelta(seconds=self.snipe_extension_seconds)
+
+    def check_bid(self, user_id: int, amount: Decimal, now: datetime) -> Optional[int]:
+        """Validate a new bid and return the id of the user's existing bid, if any"""
+        if not self.is_active:
+            raise BidRejected(400, "Auction is closed")
+
+        if self.deadline <= now:
+            raise BidRejected(400, "Auction has ended")
+
+        if self.top_amount is not None and amount <= self.top_amount:
+            raise BidRejected(
+                400, f"Bid must be higher than the current highest bid of {self.top_amount}"
+            )
+
+        existing = self.user_bids.get(user_id)
+        return existing[0] if existing else None
+
+    def apply_bid(self, bid_id: int, user_id: int, amount: Decimal):
+        """Record a bid that has been committed to the database"""
+        is_new = user_id not in self.user_bids
+        self.user_bids[user_id] = (bid_id, amount)
+        if is_new:
+            self.bid_count += 1
+
+        if self.top_amount is None or amount > self.top_amount:
+            self.top_bid_id, self.top_user_id, self.top_amount = bid_id, user_id, amount
+        elif bid_id == self.top_bid_id:
+            # The top bid was lowered, find the new leader
+            self._recompute_top()
+
+    def resolve_proxies(
+        self, top_user_id: Optional[int], top_amount: Optional[Decimal], increment: Decimal
+    ) -> List[Tuple[int, Decimal]]:
+        """Settle the proxy bids against the given top bid in one step
+
+        Returns the (user_id, amount) bids the proxies have to place, the
+        last one being the new top bid, or an empty list when the top bid
+        stands. Like an English auction, the strongest proxy pays one
+        increment over the best rival, capped at its own maximum; equal
+        maximums go to the earlier proxy. Rival proxies it outbids are
+        recorded at their maximum first, so the history shows why they lost.
+        """
+        if not self.proxies:
+            return []
+
+        ranked = sorted(self.proxies.items(), key=lambda item: (-item[1][0], item[1][1]))
+        leader, (limit, _) = ranked[0]
+        # Proxies already below the top bid take no part
+        rivals = [
+            (user_id, max_amount) for user_id, (max_amount, _) in ranked[1:]
+            if top_amount is None or max_amount > top_amount
+        ]
+        if top_user_id == leader and not rivals:
+            # The leader holds the top bid, it never bids against itself
+            return []
+
+        best = [max_amount for _, max_amount in rivals]
+        if top_user_id is not None and top_user_id != leader:
+            best.append(top_amount)
+        if best:
+            amount = min(limit, max(best) + increment)
+        else:
+            # A lone proxy opens the auction at the starting price
+            amount = min(limit, self.starting_price)
+
+        if top_amount is not None and amount <= top_amount:
+            return []
+        outbid = [(user_id, max_amount) for user_id, max_amount in reversed(rivals) if max_amount < amount]
+        return outbid + [(leader, amount)]
+
+    def remove_bid(self, user_id: int):
+        if self.user_bids.pop(user_id, None) is None:
+            return
+        self.bid_count = max(self.bid_count - 1, 0)
+        if user_id == self.top_user_id:
+            self._recompute_top()
+
+    def _recompute_top(self):
+        self.top_bid_id = self.top_user_id = self.top_amount = None
+        for user_id, (bid_id, amount) in self.user_bids.items():
+            if self.top_amount is None or amount > self.top_amount:
+                self.top_bid_id, self.top_user_id, self.top_amount = bid_id, user_id, amount
+
+
+class OrderBook:
+    """Per-plate order books kept in memory and written through to the database"""
+
+    def __init__(self, lock_shards: int = 256):
+        self.plates: Dict[int, PlateBook] = {}
+        # Bids are admitted one at a time per plate; plates sharing a shard
+        # wait for each other too, which is rare with enough shards
+        self.locks = [asyncio.Lock() for _ in range(lock_shards)]
+        self.lock_acquisitions = 0
+        self.lock_contended = 0
+        self.lock_wait_seconds = 0.0
+        self.lock_max_wait_seconds = 0.0
+        self.version_conflicts = 0
+
+    @asynccontextmanager
+    async def lock(self, *plate_ids: int, db: Optional[AsyncSession] = None):
+        """Hold the admission locks of the given plates
+
+        Shards are taken in index order, so batches spanning several plates
+        cannot deadlock each other. The session's connection is checked out
+        before waiting: a lock holder waiting for the pool while the pool is
+        held by requests waiting for the lock would never get one.
+        """
+        acquired = []
+        try:
+            if db is not None:
+                await db.connection()
+            for shard in sorted({plate_id % len(self.locks) for plate_id in plate_ids}):
+                lock = self.locks[shard]
+                self.lock_acquisitions += 1
+                if lock.locked():
+                    self.lock_contended += 1
+                    started = time.perf_counter()
+                    await lock.acquire()
+                    waited = time.perf_counter() - started
+                    self.lock_wait_seconds += waited
+                    self.lock_max_wait_seconds = max(self.lock_max_wait_seconds, waited)
+                else:
+                    await lock.acquire()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+
+    def stats(self) -> dict:
+        return {
+            "plates": len(self.plates),
+            "lock_shards": len(self.locks),
+            "lock_acquisitions": self.lock_acquisitions,
+            "lock_contended": self.lock_contended,
+            "lock_contention_ratio": (
+                round(self.lock_contended / self.lock_acquisitions, 4) if self.lock_acquisitions else 0.0
+            ),
+            "lock_wait_seconds": round(self.lock_wait_seconds, 3),
+            "lock_max_wait_seconds": round(self.lock_max_wait_seconds, 3),
+            "version_conflicts": self.version_conflicts,
+        }
+
+    async def hydrate(self, db: AsyncSession):
+        """Load every active plate, its bids and proxies with three queries"""
+        self.plates = {}
+        plates = await db.scalars(
+            select(models.AutoPlate).where(models.AutoPlate.is_active == True)
+        )
+        for plate in plates:
+            self.plates[plate.id] = PlateBook(plate)
+
+        bids = await db.execute(
+            select(models.Bid.id, models.Bid.user_id, models.Bid.plate_id, models.Bid.amount)
+            .join(models.AutoPlate)
+            .where(models.AutoPlate.is_active == True)
+            .order_by(models.Bid.amount.asc())
+        )
+        for bid_id, user_id, plate_id, amount in bids:
+            self._load_bid(self.plates[plate_id], bid_id, user_id, amount)
+
+        proxies = await db.execute(
+            select(models.ProxyBid.user_id, models.ProxyBid.plate_id,
+                   models.ProxyBid.max_amount, models.ProxyBid.created_at)
+            .join(models.AutoPlate)
+            .where(models.AutoPlate.is_active == True)
+        )
+        for user_id, plate_id, max_amount, created_at in proxies:
+            self.plates[plate_id].proxies[user_id] = (max_amount, created_at)
+
+    async def get(self, db: AsyncSession, plate_id: int) -> Optional[PlateBook]:
+        """Return the book of a plate, loading it from the database on a miss"""
+        book = self.plates.get(plate_id)
+        if book is not None:
+            return book
+
+        plate = await db.get(models.AutoPlate, plate_id)
+        if not plate:
+            return None
+
+        book = PlateBook(plate)
+        bids = await db.execute(
+            select(models.Bid.id, models.Bid.user_id, models.Bid.amount)
+            .where(models.Bid.plate_id == plate_id)
+            .order_by(models.Bid.amount.asc())
+        )
+        for bid_id, user_id, amount in bids:
+            self._load_bid(book, bid_id, user_id, amount)
+
+        proxies = await db.execute(
+            select(models.ProxyBid.user_id, models.ProxyBid.max_amount, models.ProxyBid.created_at)
+            .where(models.ProxyBid.plate_id == plate_id)
+        )
+        for user_id, max_amount, created_at in proxies:
+            book.proxies[user_id] = (max_amount, created_at)
+
+        if not book.is_active:
+            # Closed plates take no more bids, their books are not kept
+            return book
+        # A concurrent request may have loaded the plate while we awaited
+        return self.plates.setdefault(plate_id, book)
+
+    def update_plate(self, plate: models.AutoPlate):
+        book = self.plates.get(plate.id)
+        if book is None:
+            return
+        if plate.is_active:
+            book.update_plate(plate)
+        else:
+            self.discard(plate.id)
+
+    def discard(self, plate_id: int):
+        self.plates.pop(plate_id, None)
+
+    def _load_bid(self, book: PlateBook, bid_id: int, user_id: int, amount: Decimal):
+        # Bids arrive in ascending amount order, so the last one per user wins
+        book.user_bids[user_id] = (bid_id, amount)
+        book.top_bid_id, book.top_user_id, book.top_amount = bid_id, user_id, amount
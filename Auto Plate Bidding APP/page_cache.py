@@ -0,0 +1,86 @@
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+
+class PageCache:
+    """LRU of rendered HTML pages, dropped by tag when their data changes
+
+    Pages are tagged with what they show, ``plate:<id>`` for a single plate
+    and ``listing`` for plate lists. Size is bounded by entry count and by
+    total body bytes.
+
+    Every invalidation bumps a generation counter. A page rendered across an
+    invalidation is not stored, so a slow render can never put stale HTML
+    back after the change that made it stale.
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (body, tags)
+        self.entries: "OrderedDict[str, Tuple[bytes, Tuple[str, ...]]]" = OrderedDict()
+        self.keys_by_tag: Dict[str, Set[str]] = {}
+        self.size_bytes = 0
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: str, body: bytes, tags: Iterable[str], generation: int):
+        """Store a page rendered when the cache was at ``generation``"""
+        if generation != self.generation or len(body) > self.max_bytes:
+            return
+
+        self._remove(key)
+        tags = tuple(tags)
+        self.entries[key] = (body, tags)
+        self.size_bytes += len(body)
+        for tag in tags:
+            self.keys_by_tag.setdefault(tag, set()).add(key)
+
+        while len(self.entries) > self.max_entries or self.size_bytes > self.max_bytes:
+            self._remove(next(iter(self.entries)))
+
+    def invalidate(self, *tags: str):
+        self.generation += 1
+        self.invalidations += 1
+        for tag in tags:
+            for key in list(self.keys_by_tag.get(tag, ())):
+                self._remove(key)
+
+    def invalidate_plate(self, plate_id: int):
+        self.invalidate(f"plate:{plate_id}", "listing")
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: str):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        body, tags = entry
+        self.size_bytes -= len(body)
+        for tag in tags:
+            keys = self.keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.keys_by_tag[tag]
@@ -0,0 +1,72 @@
+import base64
+import json
+from datetime import datetime
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, tuple_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def encode_cursor(*values, order: str = "") -> str:
+    """Pack the sort order and the sort key of the last row into an opaque token"""
+    key = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps({"order": order, "key": key})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, *types, order: str = "") -> tuple:
+    """Unpack a cursor made by encode_cursor, converting each value to ``types``
+
+    A cursor only continues the listing it was made for, one made under
+    another sort order raises InvalidCursor.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, dict):
+            raise ValueError("Malformed cursor")
+        values = payload.get("key")
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("Wrong number of cursor values")
+        key = tuple(
+            datetime.fromisoformat(value) if type_ is datetime else type_(value)
+            for type_, value in zip(types, values)
+        )
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if payload.get("order") != order:
+        raise InvalidCursor("Cursor does not match the requested ordering")
+    return key
+
+def keyset(
+    query: Select,
+    columns: Sequence,
+    after: Optional[tuple],
+    limit: int,
+    descending: bool = False
+) -> Select:
+    """Restrict a query to the page following the row with sort key ``after``
+
+    ``columns`` must end with a unique column so the key is a total order.
+    One extra row is fetched to know whether another page follows.
+    """
+    if after is not None:
+        key = tuple_(*columns)
+        bound = tuple_(*after, types=[column.type for column in columns])
+        query = query.where(key < bound if descending else key > bound)
+
+    order = [column.desc() if descending else column.asc() for column in columns]
+    return query.order_by(*order).limit(limit + 1)
+
+def split_page(rows: Sequence, limit: int, key: Callable, order: str = "") -> Tuple[List, Optional[str]]:
+    """Trim the extra row fetched by keyset() and build the next cursor"""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*key(rows[-1]), order=order)
@@ -0,0 +1,77 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+
+class HasherBusy(Exception):
+    """Raised when too many hashing jobs are already waiting"""
+
+
+class PasswordHasher:
+    """Runs bcrypt in a dedicated thread pool instead of the event loop
+
+    bcrypt releases the GIL while hashing, so threads give real
+    parallelism. At most ``max_pending`` jobs may be queued or running,
+    further calls fail fast with HasherBusy so a login spike cannot pile
+    up unbounded work.
+    """
+
+    def __init__(
+        self,
+        pwd_context: CryptContext,
+        max_workers: int = 4,
+        max_pending: int = 64,
+        rehash_on_login: bool = False
+    ):
+        self.pwd_context = pwd_context
+        self.max_pending = max_pending
+        self.rehash_on_login = rehash_on_login
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self.pending = 0
+        self.rejected = 0
+        self.rehashed = 0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.pwd_context.hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(self.pwd_context.verify, password, hashed)
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """Verify a password, returning a new hash if the stored one is outdated
+
+        The new hash is only produced when rehash_on_login is enabled, for
+        example after the bcrypt cost was raised.
+        """
+        if not self.rehash_on_login:
+            return await self.verify(password, hashed), None
+
+        valid, new_hash = await self._run(self.pwd_context.verify_and_update, password, hashed)
+        if new_hash:
+            self.rehashed += 1
+        return valid, new_hash
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending,
+            "max_pending": self.max_pending,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+        }
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+    async def _run(self, func, *args):
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise HasherBusy()
+
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self.pending -= 1
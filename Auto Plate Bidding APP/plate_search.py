@@ -0,0 +1,78 @@
+import re
+from typing import Optional
+
+from sqlalchemy import and_, column, select, table, text
+
+import models
+
+# Trigram index over auto_plates.plate_number. The FTS5 table holds no
+# copy of the data (external content), triggers keep it in sync and only
+# fire when plate_number itself changes.
+FTS_TABLE = "plate_number_fts"
+
+FTS_SCHEMA = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        plate_number, content='auto_plates', content_rowid='id', tokenize='trigram'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS auto_plates_fts_insert AFTER INSERT ON auto_plates BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, plate_number) VALUES (new.id, new.plate_number);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS auto_plates_fts_delete AFTER DELETE ON auto_plates BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, plate_number) VALUES ('delete', old.id, old.plate_number);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS auto_plates_fts_update AFTER UPDATE OF plate_number ON auto_plates BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, plate_number) VALUES ('delete', old.id, old.plate_number);
+        INSERT INTO {FTS_TABLE}(rowid, plate_number) VALUES (new.id, new.plate_number);
+    END""",
+]
+
+# Trigrams need three consecutive literal characters to narrow a search
+TRIGRAM = re.compile(r"[0-9A-Za-z]{3}")
+SEARCH_TERM = re.compile(r"[0-9A-Za-z]+")
+
+plate_number_fts = table(FTS_TABLE, column("rowid"), column("plate_number"))
+
+
+def create_index(connection):
+    """Create the trigram index if missing and fill it from auto_plates"""
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": FTS_TABLE}
+    ).first()
+    for statement in FTS_SCHEMA:
+        connection.execute(text(statement))
+    if not exists:
+        connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+def plate_number_condition(contains: Optional[str] = None, pattern: Optional[str] = None):
+    """WHERE clause for a substring and/or GLOB search on plate numbers
+
+    ``contains`` is a case-insensitive substring. ``pattern`` is a GLOB over
+    the upper-case plate number, for vanity searches such as ``*777*``,
+    ``??A777??`` or ``01[A-Z]*``. Searches with a run of three letters or
+    digits are answered by the trigram index, shorter ones fall back to
+    filtering auto_plates directly.
+    """
+    conditions = []
+    plate_number = models.AutoPlate.plate_number
+
+    if contains:
+        if SEARCH_TERM.fullmatch(contains) and TRIGRAM.search(contains):
+            conditions.append(models.AutoPlate.id.in_(
+                select(plate_number_fts.c.rowid)
+                .where(plate_number_fts.c.plate_number.like(f"%{contains}%"))
+            ))
+        else:
+            conditions.append(plate_number.ilike(f"%{contains}%"))
+
+    if pattern:
+        pattern = pattern.upper()
+        if TRIGRAM.search(pattern):
+            conditions.append(models.AutoPlate.id.in_(
+                select(plate_number_fts.c.rowid)
+                .where(plate_number_fts.c.plate_number.op("GLOB")(pattern))
+            ))
+        else:
+            conditions.append(plate_number.op("GLOB")(pattern))
+
+    return and_(*conditions) if conditions else None
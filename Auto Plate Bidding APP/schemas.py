@@ -1,5 +1,5 @@
 # schemas.py
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, StrictInt, validator
 from typing import Optional, List
 from datetime import datetime
 from decimal import Decimal
@@ -31,6 +31,8 @@ class AutoPlateBase(BaseModel):
     description: str
     deadline: datetime
     starting_price: Decimal = Field(default=1000, gt=0)
+    snipe_window_seconds: Optional[int] = Field(default=None, ge=0)
+    snipe_extension_seconds: Optional[int] = Field(default=None, ge=0)
     
     @validator('deadline')
     def ensure_future_deadline(cls, v):
@@ -60,6 +62,7 @@ class AutoPlateResponse(AutoPlateBase):
 
 class AutoPlateWithHighestBid(AutoPlateResponse):
     highest_bid: Optional[Decimal] = None
+    bid_count: int = 0
 
 # Bid Schemas
 class BidBase(BaseModel):
@@ -80,6 +83,28 @@ class BidResponse(BidBase):
 class BidWithUser(BidResponse):
     user: UserResponse
 
+class BidBatchResult(BaseModel):
+    plate_id: int
+    status_code: int
+    bid: Optional[BidResponse] = None
+    detail: Optional[str] = None
+
+class ProxyBidCreate(BaseModel):
+    plate_id: int
+    max_amount: Decimal = Field(..., gt=0)
+
+class ProxyBidResponse(ProxyBidCreate):
+    id: int
+    user_id: int
+    created_at: datetime
+    current_bid: Optional[Decimal] = None
+
+# WebSocket Schemas
+class SubscriptionRequest(BaseModel):
+    action: str
+    # Not coerced, "1" or 1.5 are rejected rather than guessed at
+    plate_ids: Optional[List[StrictInt]] = None
+
 # Combined Schemas
 class AutoPlateWithBids(AutoPlateResponse):
     bids: List[BidResponse] = []
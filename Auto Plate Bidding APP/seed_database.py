@@ -51,6 +51,7 @@ def seed_database():
         
         # Clear tables if they exist
         try:
+            db.execute(text("DELETE FROM proxy_bids"))
             db.execute(text("DELETE FROM bids"))
             db.execute(text("DELETE FROM auto_plates"))
             db.execute(text("DELETE FROM users"))
@@ -116,8 +117,10 @@ def seed_database():
         # Create bids
         for plate in plates:
             base_amount = plate.starting_price
-            for i in range(random.randint(1, 3)):
-                user = random.choice(users)
+            amounts = []
+            # Each user can have only one bid per plate
+            bidders = random.sample(users, random.randint(1, 3))
+            for i, user in enumerate(bidders):
                 amount = float(base_amount) + (i + 1) * random.randint(100, 1000)
                 
                 bid = models.Bid(
@@ -127,6 +130,11 @@ def seed_database():
                     created_at=datetime.now() - timedelta(hours=random.randint(1, 24))
                 )
                 db.add(bid)
+                amounts.append(bid.amount)
+            
+            # Keep the denormalized bid stats in sync
+            plate.highest_bid_amount = max(amounts)
+            plate.bid_count = len(amounts)
         
         db.commit()
         print("Database muvaffaqiyatli to'ldirildi!")
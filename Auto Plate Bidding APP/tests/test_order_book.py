@@ -0,0 +1,81 @@
+"""Proxy bid resolution and eviction of the in-memory order books"""
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import models
+from order_book import OrderBook, PlateBook
+
+INCREMENT = Decimal("100")
+NOW = datetime(2026, 1, 1, 12, 0)
+
+
+def make_plate(is_active=True):
+    return models.AutoPlate(
+        id=1,
+        deadline=NOW + timedelta(days=1),
+        is_active=is_active,
+        starting_price=Decimal("1000"),
+        bid_count=0,
+        version=0,
+    )
+
+
+def make_book(bids=(), proxies=()):
+    book = PlateBook(make_plate())
+    for bid_id, (user_id, amount) in enumerate(bids, start=1):
+        book.apply_bid(bid_id, user_id, Decimal(amount))
+    for minute, (user_id, max_amount) in enumerate(proxies):
+        book.proxies[user_id] = (Decimal(max_amount), NOW + timedelta(minutes=minute))
+    return book
+
+
+def test_leader_holding_the_top_bid_does_not_bid_against_itself():
+    book = make_book(bids=[(1, "500")], proxies=[(1, "5000")])
+    assert book.resolve_proxies(book.top_user_id, book.top_amount, INCREMENT) == []
+
+
+def test_leader_holding_the_top_bid_answers_a_rival_proxy():
+    book = make_book(bids=[(1, "1500")], proxies=[(1, "5000"), (2, "2000")])
+    assert book.resolve_proxies(book.top_user_id, book.top_amount, INCREMENT) == [
+        (2, Decimal("2000")), (1, Decimal("2100"))
+    ]
+
+
+def test_proxy_raises_one_increment_over_a_plain_bid():
+    book = make_book(proxies=[(1, "5000")])
+    assert book.resolve_proxies(2, Decimal("1200"), INCREMENT) == [(1, Decimal("1300"))]
+
+
+def test_proxy_is_capped_at_its_maximum():
+    book = make_book(proxies=[(1, "1250")])
+    assert book.resolve_proxies(2, Decimal("1200"), INCREMENT) == [(1, Decimal("1250"))]
+
+
+def test_proxy_below_the_top_bid_stands_down():
+    book = make_book(proxies=[(1, "1200")])
+    assert book.resolve_proxies(2, Decimal("1200"), INCREMENT) == []
+
+
+def test_outbid_proxies_are_recorded_at_their_maximum():
+    book = make_book(proxies=[(1, "5000"), (2, "3000"), (3, "2000"), (4, "900")])
+    assert book.resolve_proxies(5, Decimal("1200"), INCREMENT) == [
+        (3, Decimal("2000")), (2, Decimal("3000")), (1, Decimal("3100"))
+    ]
+
+
+def test_equal_maximums_go_to_the_earlier_proxy():
+    book = make_book(proxies=[(1, "3000"), (2, "3000")])
+    # The later proxy cannot be recorded at a price the winner also bids
+    assert book.resolve_proxies(5, Decimal("1200"), INCREMENT) == [(1, Decimal("3000"))]
+
+
+def test_lone_proxy_opens_at_the_starting_price():
+    book = make_book(proxies=[(1, "5000")])
+    assert book.resolve_proxies(None, None, INCREMENT) == [(1, Decimal("1000"))]
+
+
+def test_closing_a_plate_evicts_its_book():
+    order_book = OrderBook()
+    order_book.plates[1] = make_book()
+    order_book.update_plate(make_plate(is_active=False))
+    assert 1 not in order_book.plates
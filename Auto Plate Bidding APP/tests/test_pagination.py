@@ -0,0 +1,23 @@
+"""Cursor encoding of the keyset pagination"""
+from datetime import datetime
+
+import pytest
+
+from pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trips_the_sort_key():
+    cursor = encode_cursor(datetime(2026, 1, 1, 12, 30), 42, order="-deadline")
+    assert decode_cursor(cursor, datetime, int, order="-deadline") == (datetime(2026, 1, 1, 12, 30), 42)
+
+
+def test_cursor_of_another_ordering_is_rejected():
+    cursor = encode_cursor(datetime(2026, 1, 1), 42, order="deadline")
+    with pytest.raises(InvalidCursor, match="ordering"):
+        decode_cursor(cursor, datetime, int, order="-deadline")
+
+
+@pytest.mark.parametrize("cursor", ["zzz", encode_cursor(1, order="deadline")])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, datetime, int, order="deadline")
@@ -0,0 +1,124 @@
+"""EXPLAIN QUERY PLAN regressions of the hot auction queries
+
+Each query of check_query_plans.HOT_QUERIES is planned against the schema
+built from models.py and against one built by running every revision in
+alembic/versions on the baseline tables, so a missing index or a broken
+migration fails either way.
+"""
+import importlib.util
+from pathlib import Path
+
+import pytest
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, inspect
+
+import models
+import plate_search
+from check_query_plans import HOT_QUERIES, explain
+
+VERSIONS_DIR = Path(__file__).resolve().parent.parent / "alembic" / "versions"
+
+# Tables as they were before the first migration of this series
+BASELINE_REVISION = "add_starting_price"
+BASELINE_SCHEMA = [
+    """CREATE TABLE users (
+        id INTEGER NOT NULL,
+        username VARCHAR,
+        email VARCHAR,
+        password VARCHAR,
+        is_staff BOOLEAN,
+        PRIMARY KEY (id)
+    )""",
+    "CREATE UNIQUE INDEX ix_users_username ON users (username)",
+    "CREATE INDEX ix_users_id ON users (id)",
+    """CREATE TABLE auto_plates (
+        id INTEGER NOT NULL,
+        plate_number VARCHAR,
+        description VARCHAR,
+        deadline DATETIME,
+        starting_price NUMERIC(10, 2) NOT NULL,
+        created_by_id INTEGER,
+        is_active BOOLEAN,
+        PRIMARY KEY (id),
+        FOREIGN KEY(created_by_id) REFERENCES users (id)
+    )""",
+    "CREATE UNIQUE INDEX ix_auto_plates_plate_number ON auto_plates (plate_number)",
+    "CREATE INDEX ix_auto_plates_id ON auto_plates (id)",
+    """CREATE TABLE bids (
+        id INTEGER NOT NULL,
+        amount NUMERIC(10, 2),
+        user_id INTEGER,
+        plate_id INTEGER,
+        created_at DATETIME,
+        PRIMARY KEY (id),
+        FOREIGN KEY(user_id) REFERENCES users (id),
+        FOREIGN KEY(plate_id) REFERENCES auto_plates (id)
+    )""",
+    "CREATE INDEX ix_bids_id ON bids (id)",
+]
+
+
+def load_revisions() -> dict:
+    """down_revision -> migration module of every file in alembic/versions"""
+    revisions = {}
+    for path in sorted(VERSIONS_DIR.glob("*.py")):
+        spec = importlib.util.spec_from_file_location(f"migration_{path.stem}", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        assert module.down_revision not in revisions, f"{path.name} branches the migration chain"
+        revisions[module.down_revision] = module
+    return revisions
+
+
+def upgrade_from_baseline(connection):
+    revisions = load_revisions()
+    context = MigrationContext.configure(connection)
+    applied = {revisions[None].revision}
+    with Operations.context(context):
+        revision = BASELINE_REVISION
+        while revision in revisions:
+            migration = revisions[revision]
+            migration.upgrade()
+            applied.add(migration.revision)
+            revision = migration.revision
+    missing = {module.revision for module in revisions.values()} - applied
+    assert not missing, f"revisions not reachable from {BASELINE_REVISION}: {sorted(missing)}"
+
+
+@pytest.fixture(scope="module", params=["models", "migrated"])
+def engine(request, tmp_path_factory):
+    path = tmp_path_factory.mktemp("query-plans") / "auction.db"
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as connection:
+        if request.param == "models":
+            models.Base.metadata.create_all(bind=connection)
+            plate_search.create_index(connection)
+        else:
+            for statement in BASELINE_SCHEMA:
+                connection.exec_driver_sql(statement)
+            upgrade_from_baseline(connection)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def connection(engine):
+    with engine.connect() as connection:
+        yield connection
+
+
+@pytest.mark.parametrize("name", list(HOT_QUERIES))
+def test_hot_query_uses_an_index(connection, name):
+    query, forbidden = HOT_QUERIES[name]
+    plan = explain(connection, query)
+    bad = [step for step in plan if any(fragment in step for fragment in forbidden)]
+    assert not bad, f"{name}: {'; '.join(plan)}"
+
+
+def test_schema_has_every_model_column(engine):
+    inspector = inspect(engine)
+    for table in models.Base.metadata.sorted_tables:
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        missing = {column.name for column in table.columns} - columns
+        assert not missing, f"{table.name} lacks {sorted(missing)}"
@@ -1,8 +1,262 @@
+import asyncio
+import json
+import time
+from typing import Dict, Iterable, List, Optional, Set
+
+from fastapi import WebSocket
+
+from broadcast_bus import InProcessBus
+
+
+class Connection:
+    """A WebSocket with its own bounded outbound queue and writer task"""
+
+    def __init__(self, websocket: WebSocket, max_queue_size: int):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self.dropped = 0
+        self.writer: Optional[asyncio.Task] = None
+        self.plates: Set[int] = set()
+        self.last_seen = time.monotonic()
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        try:
+            await self.websocket.close(code=code, reason=reason)
+        except Exception:
+            pass
+
+
 class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[int, List[WebSocket]] = {}
+    """Fans messages out to the WebSockets watching each plate
+
+    A socket may watch any number of plates. Subscriptions are indexed both
+    ways: plate -> sockets in ``active_connections`` for fan-out, socket ->
+    plates in each Connection for cleanup. Every socket has one queue and
+    one writer however many plates it watches.
+
+    Broadcasting only enqueues the message, so a slow client never delays
+    the other watchers or the request that triggered the broadcast. When a
+    client's queue is full the oldest queued message is dropped
+    (overflow_policy="drop") or the client is disconnected
+    (overflow_policy="disconnect").
+
+    Messages travel through a pub/sub bus so that watchers connected to
+    other worker processes receive them too.
+
+    With a coalesce_window, new_bid messages of a plate are sent at most
+    once per window. The first bid after a quiet spell goes out at once and
+    opens the window; bids arriving while it is open are merged into one
+    frame sent when it closes: the latest bid's fields plus ``coalesced``
+    and the merged ``bids`` in order. Any other message first flushes the
+    pending bids, so the order of events is kept.
+
+    With a ping_interval, every socket is sent a ping message that often.
+    With a ping_timeout too, a socket that sends nothing back within it, a
+    pong or any other message, is treated as dead: it is removed from the
+    plates it watches and closed, so half-open connections stop taking
+    broadcasts. Sockets whose sends fail are dropped either way.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 100,
+        overflow_policy: str = "drop",
+        bus: Optional[InProcessBus] = None,
+        coalesce_window: float = 0.0,
+        ping_interval: float = 0.0,
+        ping_timeout: float = 0.0
+    ):
+        if overflow_policy not in ("drop", "disconnect"):
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        self.bus = bus or InProcessBus()
+        self.bus.subscribe(self.deliver)
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self.active_connections: Dict[int, Dict[WebSocket, Connection]] = {}
+        self.connections: Dict[WebSocket, Connection] = {}
+        self.dropped_messages = 0
+        self.disconnected_slow = 0
+        self.coalesce_window = coalesce_window
+        # plate_id -> new_bid messages waiting for the window to close
+        self.pending_bids: Dict[int, List[dict]] = {}
+        self.open_windows: Dict[int, asyncio.TimerHandle] = {}
+        self.coalesced_frames = 0
+        self.coalesced_messages = 0
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self.heartbeat: Optional[asyncio.Task] = None
+        self.pings_sent = 0
+        self.reaped_dead = 0
+
+    async def start(self):
+        if self.ping_interval > 0:
+            self.heartbeat = asyncio.create_task(self._heartbeat())
+
+    async def stop(self):
+        if self.heartbeat:
+            self.heartbeat.cancel()
+            self.heartbeat = None
+
+    async def connect(self, websocket: WebSocket, plate_id: Optional[int] = None):
+        await websocket.accept()
+        connection = Connection(websocket, self.max_queue_size)
+        connection.writer = asyncio.create_task(self._write(connection))
+        self.connections[websocket] = connection
+        if plate_id is not None:
+            self.subscribe(websocket, [plate_id])
+
+    def subscribe(self, websocket: WebSocket, plate_ids: Iterable[int]):
+        connection = self.connections.get(websocket)
+        if connection is None:
+            return
+        for plate_id in plate_ids:
+            connection.plates.add(plate_id)
+            self.active_connections.setdefault(plate_id, {})[websocket] = connection
+
+    def unsubscribe(self, websocket: WebSocket, plate_ids: Iterable[int]):
+        connection = self.connections.get(websocket)
+        if connection is None:
+            return
+        for plate_id in plate_ids:
+            connection.plates.discard(plate_id)
+            connections = self.active_connections.get(plate_id)
+            if connections is None:
+                continue
+            connections.pop(websocket, None)
+            if not connections:
+                del self.active_connections[plate_id]
+
+    def disconnect(self, websocket: WebSocket):
+        connection = self.connections.get(websocket)
+        if connection is None:
+            return
+        self.unsubscribe(websocket, list(connection.plates))
+        del self.connections[websocket]
+        if connection.writer is not asyncio.current_task():
+            connection.writer.cancel()
+
+    def touch(self, websocket: WebSocket):
+        """Record that the client is alive, called for every message it sends"""
+        connection = self.connections.get(websocket)
+        if connection is not None:
+            connection.last_seen = time.monotonic()
+
+    def subscriptions(self, websocket: WebSocket) -> Set[int]:
+        connection = self.connections.get(websocket)
+        return set(connection.plates) if connection else set()
+
+    def send(self, websocket: WebSocket, message: str):
+        """Queue a message for one socket, behind what is already queued"""
+        connection = self.connections.get(websocket)
+        if connection is not None:
+            self._enqueue(connection, message)
 
     async def broadcast(self, message: str, plate_id: int):
-        if plate_id in self.active_connections:
-            for connection in self.active_connections[plate_id]:
-                await connection.send_text(message)
\ No newline at end of file
+        await self.bus.publish(message, plate_id)
+
+    def deliver(self, message: str, plate_id: int, local: bool = True):
+        """Queue a message for the sockets of this process watching the plate"""
+        if self.coalesce_window > 0 and plate_id in self.active_connections:
+            payload = json.loads(message)
+            if payload.get("action") == "new_bid":
+                if plate_id in self.open_windows:
+                    self.pending_bids.setdefault(plate_id, []).append(payload)
+                    return
+                self._open_window(plate_id)
+            elif plate_id in self.pending_bids:
+                self._close_window(plate_id)
+        self._fan_out(message, plate_id)
+
+    def _fan_out(self, message: str, plate_id: int):
+        for connection in list(self.active_connections.get(plate_id, {}).values()):
+            self._enqueue(connection, message)
+
+    def _enqueue(self, connection: Connection, message: str):
+        try:
+            connection.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self._overflow(connection, message)
+
+    def _open_window(self, plate_id: int):
+        loop = asyncio.get_running_loop()
+        self.open_windows[plate_id] = loop.call_later(self.coalesce_window, self._close_window, plate_id)
+
+    def _close_window(self, plate_id: int):
+        handle = self.open_windows.pop(plate_id, None)
+        if handle is not None:
+            handle.cancel()
+        pending = self.pending_bids.pop(plate_id, None)
+        if not pending:
+            return
+
+        frame = dict(pending[-1])
+        if len(pending) > 1:
+            frame["coalesced"] = len(pending)
+            frame["bids"] = [
+                {key: bid.get(key) for key in ("bid_amount", "bidder_id", "bidder_username", "proxy", "timestamp")}
+                for bid in pending
+            ]
+            self.coalesced_frames += 1
+            self.coalesced_messages += len(pending)
+        self._fan_out(json.dumps(frame), plate_id)
+        # Bids are still coming, keep limiting the rate
+        self._open_window(plate_id)
+
+    def stats(self) -> dict:
+        depths = [connection.queue.qsize() for connection in self.connections.values()]
+        return {
+            "plates": len(self.active_connections),
+            "connections": len(depths),
+            "subscriptions": sum(len(connections) for connections in self.active_connections.values()),
+            "queued_messages": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "pending_bids": sum(len(pending) for pending in self.pending_bids.values()),
+            "dropped_messages": self.dropped_messages,
+            "disconnected_slow": self.disconnected_slow,
+            "pings_sent": self.pings_sent,
+            "reaped_dead": self.reaped_dead,
+            "coalesced_frames": self.coalesced_frames,
+            "coalesced_messages": self.coalesced_messages,
+        }
+
+    def _overflow(self, connection: Connection, message: str):
+        if self.overflow_policy == "disconnect":
+            self.disconnected_slow += 1
+            self.disconnect(connection.websocket)
+            asyncio.create_task(connection.close(code=1013, reason="Too slow"))
+            return
+
+        # Keep the latest state: drop the oldest queued message
+        connection.queue.get_nowait()
+        connection.queue.put_nowait(message)
+        connection.dropped += 1
+        self.dropped_messages += 1
+
+    async def _write(self, connection: Connection):
+        while True:
+            message = await connection.queue.get()
+            try:
+                await connection.websocket.send_text(message)
+            except Exception:
+                # The client went away, stop delivering to it
+                self.disconnect(connection.websocket)
+                return
+
+    async def _heartbeat(self):
+        ping = json.dumps({"action": "ping"})
+        while True:
+            await asyncio.sleep(self.ping_interval)
+            sent_at = time.monotonic()
+            for connection in list(self.connections.values()):
+                self._enqueue(connection, ping)
+                self.pings_sent += 1
+            if not self.ping_timeout:
+                continue
+
+            await asyncio.sleep(self.ping_timeout)
+            for connection in list(self.connections.values()):
+                # Sockets connected after the ping are newer than sent_at too
+                if connection.last_seen < sent_at:
+                    self.reaped_dead += 1
+                    self.disconnect(connection.websocket)
+                    asyncio.create_task(connection.close(code=1001, reason="Ping timeout"))